@@ -0,0 +1,126 @@
+"""
+Chrome 死活監視モジュール（日向エージェント用）
+
+hinata_agent.py と claude_executor.py の両方から使う Chrome の起動・再起動・
+ヘルスチェック。Slack 通知は呼び出し側が行う。
+"""
+
+import logging
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("hinata.chrome")
+
+CHROME_PROFILE_DIR = Path.home() / "agents" / "System" / "data" / "hinata_chrome_profile"
+
+# 一度見つけた Chrome のメインプロセス PID（毎回 pgrep しないためのキャッシュ）
+_chrome_pid: Optional[int] = None
+
+
+def _find_chrome_pid() -> Optional[int]:
+    """pgrep で Chrome のメインプロセス（最古のもの）の PID を探す。"""
+    try:
+        result = subprocess.run(
+            ["pgrep", "-o", "-f", "Google Chrome"],
+            capture_output=True, text=True, timeout=5,
+        )
+        if result.returncode != 0:
+            return None
+        return int(result.stdout.split()[0])
+    except Exception:
+        return None
+
+
+def is_chrome_running() -> bool:
+    """Chrome プロセスが起動しているか確認する。
+
+    キャッシュ済み PID があれば os.kill(pid, 0) で生存確認し、
+    見つからないときだけ pgrep にフォールバックする。
+    """
+    global _chrome_pid
+    if _chrome_pid:
+        try:
+            os.kill(_chrome_pid, 0)
+            return True
+        except PermissionError:
+            return True  # プロセスは存在する（シグナル権限がないだけ）
+        except OSError:
+            _chrome_pid = None
+    _chrome_pid = _find_chrome_pid()
+    return _chrome_pid is not None
+
+
+def is_chrome_cdp_healthy() -> bool:
+    """Chrome DevTools Protocol (CDP) ポート 9223 が応答するか確認する。
+
+    プロセスが生きていても MCP 接続が死んでいるケースを検知する。
+    """
+    try:
+        result = subprocess.run(
+            ["curl", "-s", "-o", "/dev/null", "-w", "%{http_code}",
+             "--connect-timeout", "3", "--max-time", "5",
+             "http://localhost:9223/json/version"],
+            capture_output=True, text=True, timeout=10,
+        )
+        status_code = result.stdout.strip()
+        if status_code == "200":
+            return True
+        logger.warning("CDP ヘルスチェック失敗: HTTP %s", status_code)
+        return False
+    except Exception as e:
+        logger.warning("CDP ヘルスチェック例外: %s", e)
+        return False
+
+
+def restart_chrome() -> bool:
+    """Chrome を強制終了して再起動する。MCP 接続が不安定な場合に使用。"""
+    global _chrome_pid
+    logger.warning("Chrome を再起動します...")
+    _chrome_pid = None
+    try:
+        # Chrome を終了（graceful → force）
+        subprocess.run(["pkill", "-f", "Google Chrome"], timeout=5)
+        time.sleep(3)
+        # まだ残っていたら強制終了
+        if is_chrome_running():
+            subprocess.run(["pkill", "-9", "-f", "Google Chrome"], timeout=5)
+            time.sleep(2)
+    except Exception as e:
+        logger.warning("Chrome 終了時エラー（続行）: %s", e)
+
+    # 再起動
+    return start_chrome()
+
+
+def start_chrome() -> bool:
+    """Chrome を起動して CDP ポートの疎通を確認する。"""
+    try:
+        subprocess.Popen(
+            ["open", "-a", "Google Chrome", "--args",
+             f"--user-data-dir={CHROME_PROFILE_DIR}",
+             "--remote-debugging-port=9223",
+             "--no-first-run",
+             "--no-default-browser-check"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # Chrome 起動待ち → CDP 疎通確認（最大30秒）
+        for i in range(6):
+            time.sleep(5)
+            if is_chrome_running() and is_chrome_cdp_healthy():
+                logger.info("Chrome 起動成功（CDP 疎通確認済み）")
+                return True
+            logger.info("Chrome 起動待ち... (%s秒)", (i+1)*5)
+
+        # プロセスはあるが CDP が応答しない
+        if is_chrome_running():
+            logger.warning("Chrome プロセスは起動したが CDP ポートが応答しません")
+            return True  # プロセスはあるので一応 True
+        logger.error("Chrome 起動失敗")
+        return False
+    except Exception as e:
+        logger.error("Chrome 起動エラー: %s", e)
+        return False
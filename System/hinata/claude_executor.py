@@ -5,16 +5,19 @@ Claude in Chrome MCP ツールでブラウザを直接操作。
 Addness操作もアクション実行も全てClaude Codeが行う。
 """
 
+import collections
 import logging
 import os
 import signal
 import subprocess
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple
 
-from learning import build_learning_context
+from chrome_control import restart_chrome
+from learning import build_learning_context_parts
 
 logger = logging.getLogger("hinata.claude")
 
@@ -28,6 +31,10 @@ SELF_RESTART_SH = str(Path(__file__).parent / "self_restart.sh")
 # ※ 秘書（~/.claude-secretary）やデフォルト（~/.claude）とは分離
 _CLAUDE_HINATA_CONFIG = Path.home() / ".claude-hinata"
 
+# claude -p の出力キャプチャ上限（超過分は古い方から捨てる）
+STDOUT_CAPTURE_LIMIT = 64 * 1024
+STDERR_CAPTURE_LIMIT = 4 * 1024
+
 
 def _claude_env() -> dict:
     """Claude Code 実行時の環境変数を構築する。"""
@@ -38,6 +45,39 @@ def _claude_env() -> dict:
     return env
 
 
+class _BoundedReader(threading.Thread):
+    """パイプを読み続け、末尾 limit 文字だけをメモリに保持するスレッド。"""
+
+    def __init__(self, stream, limit: int):
+        super().__init__(daemon=True)
+        self._stream = stream
+        self._limit = limit
+        self._chunks = collections.deque()
+        self._size = 0
+
+    def run(self):
+        try:
+            for chunk in iter(lambda: self._stream.read(4096), ""):
+                self._chunks.append(chunk)
+                self._size += len(chunk)
+                while self._size - len(self._chunks[0]) >= self._limit:
+                    self._size -= len(self._chunks.popleft())
+        except (OSError, ValueError):
+            # 読めなくなっても EOF まではバイト列で読み捨てる（子がパイプ満杯で止まらないように）
+            self._discard_rest()
+
+    def _discard_rest(self):
+        try:
+            raw = self._stream.buffer
+            while raw.read(4096):
+                pass
+        except (OSError, ValueError, AttributeError):
+            pass  # プロセス強制終了でパイプが閉じられた
+
+    def text(self) -> str:
+        return "".join(self._chunks)[-self._limit:]
+
+
 def _kill_process_group(proc: subprocess.Popen):
     """プロセスグループ全体を SIGTERM → SIGKILL で確実に終了させる。"""
     try:
@@ -85,6 +125,8 @@ def _run_claude(
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
+            encoding="utf-8",
+            errors="replace",  # 不正なバイト列で読み取りスレッドが止まらないようにする
             cwd=str(WORK_DIR),
             env=_claude_env(),
             start_new_session=True,
@@ -94,87 +136,48 @@ def _run_claude(
     except Exception as e:
         return None, f"プロセス起動失敗: {e}"
 
+    stdout_reader = _BoundedReader(proc.stdout, STDOUT_CAPTURE_LIMIT)
+    stderr_reader = _BoundedReader(proc.stderr, STDERR_CAPTURE_LIMIT)
+    stdout_reader.start()
+    stderr_reader.start()
+
     try:
-        stdout, stderr = proc.communicate(timeout=timeout_seconds)
+        proc.wait(timeout=timeout_seconds)
     except subprocess.TimeoutExpired:
-        logger.error(f"{label} タイムアウト（{timeout_seconds}秒）")
+        logger.error("%s タイムアウト（%s秒）", label, timeout_seconds)
         _kill_process_group(proc)
+        stdout_reader.join(timeout=5)
+        partial = stdout_reader.text().strip()
+        if partial:
+            logger.warning("%s タイムアウト時の途中出力（末尾）: %s", label, partial[-500:])
         return None, f"タイムアウト（{timeout_seconds}秒）"
 
+    # 孫プロセスがパイプを握ったままでも止まらないよう join は上限付き
+    stdout_reader.join(timeout=10)
+    stderr_reader.join(timeout=10)
+    stdout = stdout_reader.text()
+    stderr = stderr_reader.text()
+
     # stderr は常にログに残す（exit code 0 でも診断情報が含まれる）
-    if stderr and stderr.strip():
-        logger.info(f"{label} stderr: {stderr.strip()[:500]}")
+    if stderr and logger.isEnabledFor(logging.INFO):
+        stderr_head = stderr.strip()[:500]
+        if stderr_head:
+            logger.info("%s stderr: %s", label, stderr_head)
 
     if proc.returncode != 0:
-        logger.error(f"{label} エラー (code={proc.returncode}): {stderr[:300]}")
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("%s エラー (code=%s): %s", label, proc.returncode, stderr[:300])
         return None, f"exit code {proc.returncode}: {stderr[:200]}"
 
     output = stdout.strip()
     if not output:
-        logger.warning(f"{label} 空出力（exit code 0 だが stdout が空）")
+        logger.warning("%s 空出力（exit code 0 だが stdout が空）", label)
         return None, "空出力（stdout が空）"
 
-    logger.info(f"{label} 完了（{len(output)}文字）")
+    logger.info("%s 完了（%d文字）", label, len(output))
     return output, None
 
 
-def _restart_chrome_for_mcp() -> bool:
-    """MCP 接続復旧のため Chrome を再起動する。
-
-    hinata_agent.py の restart_chrome() を呼び出す。
-    claude_executor は hinata_agent をインポートしないため、直接実装。
-    """
-    import subprocess as sp
-    try:
-        # Chrome 終了
-        sp.run(["pkill", "-f", "Google Chrome"], timeout=5)
-        time.sleep(3)
-        # まだ残っていたら強制終了
-        try:
-            result = sp.run(["pgrep", "-f", "Google Chrome"],
-                            capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                sp.run(["pkill", "-9", "-f", "Google Chrome"], timeout=5)
-                time.sleep(2)
-        except Exception:
-            pass
-
-        # Chrome 再起動
-        chrome_profile = Path.home() / "agents" / "System" / "data" / "hinata_chrome_profile"
-        sp.Popen(
-            ["open", "-a", "Google Chrome", "--args",
-             f"--user-data-dir={chrome_profile}",
-             "--remote-debugging-port=9223",
-             "--no-first-run",
-             "--no-default-browser-check"],
-            stdout=sp.DEVNULL,
-            stderr=sp.DEVNULL,
-        )
-
-        # CDP ポート疎通待ち（最大30秒）
-        for i in range(6):
-            time.sleep(5)
-            try:
-                check = sp.run(
-                    ["curl", "-s", "-o", "/dev/null", "-w", "%{http_code}",
-                     "--connect-timeout", "3", "--max-time", "5",
-                     "http://localhost:9223/json/version"],
-                    capture_output=True, text=True, timeout=10,
-                )
-                if check.stdout.strip() == "200":
-                    logger.info(f"Chrome 再起動成功（CDP 疎通確認、{(i+1)*5}秒）")
-                    return True
-            except Exception:
-                pass
-            logger.info(f"Chrome 再起動待ち... ({(i+1)*5}秒)")
-
-        logger.warning("Chrome 再起動: CDP 疎通確認できず（プロセスは起動した可能性あり）")
-        return True  # プロセスは立ち上がっている可能性があるので続行
-    except Exception as e:
-        logger.error(f"Chrome 再起動失敗: {e}")
-        return False
-
-
 def _is_mcp_disconnect_error(error: str) -> bool:
     """エラー内容が MCP 接続切断かどうかを判定する。"""
     if not error:
@@ -211,19 +214,19 @@ def _run_claude_with_retry(
 
     # MCP 接続切断なら Chrome 再起動して --chrome で再試行
     if _is_mcp_disconnect_error(error):
-        logger.warning(f"{label} MCP 接続切断を検知: {error}。Chrome を再起動して再試行します")
-        if _restart_chrome_for_mcp():
+        logger.warning("%s MCP 接続切断を検知: %s。Chrome を再起動して再試行します", label, error)
+        if restart_chrome():
             result, error = _run_claude(
                 prompt, timeout_seconds, f"{label}（Chrome再起動後）",
                 use_chrome=True, max_turns=max_turns,
             )
             if result:
                 return result
-            logger.warning(f"{label} Chrome 再起動後も失敗: {error}")
+            logger.warning("%s Chrome 再起動後も失敗: %s", label, error)
         else:
-            logger.warning(f"{label} Chrome 再起動失敗")
+            logger.warning("%s Chrome 再起動失敗", label)
     else:
-        logger.warning(f"{label} --chrome モード失敗（MCP以外のエラー）: {error}")
+        logger.warning("%s --chrome モード失敗（MCP以外のエラー）: %s", label, error)
 
     time.sleep(3)
 
@@ -232,7 +235,7 @@ def _run_claude_with_retry(
     if result:
         return result
 
-    logger.error(f"{label} 全リトライ失敗: {error}")
+    logger.error("%s 全リトライ失敗: %s", label, error)
     return None
 
 
@@ -257,8 +260,10 @@ def execute_full_cycle(
             f"「{instruction}」\n"
         )
 
-    # learning.py が構築する学習コンテキスト（行動ルール・アクション履歴・フィードバック・記憶・知見）
-    learning_section = build_learning_context()
+    # learning.py が構築する学習コンテキスト
+    # 静的部分（行動ルール・原則・記憶・知見）はサイクル間でほぼ不変なのでプロンプト前方に、
+    # 動的部分（直近アクション・フィードバック）は現在の状態の後ろに置く
+    learning_static, learning_dynamic = build_learning_context_parts()
 
     # config.json の mode（自律サイクルの制御に使う。直接指示には影響しない）
     mode = (state or {}).get("_config_mode", "report")
@@ -298,11 +303,11 @@ def execute_full_cycle(
 
 **成長の道筋:** Lv.1（従業員型）→ Lv.2（右腕型）→ Lv.3（共同経営者型）
 権限がボトルネックになったと感じたら「次のレベルに挑戦したいです」と甲原さんに提案する
-
+{learning_static}
 ## 現在の状態
 
 現在: {now} / サイクル: #{cycle_num} / 前回のアクション: {last_action}
-{instruction_section}{learning_section}
+{instruction_section}{learning_dynamic}
 ## やるべきこと
 
 {"### 甲原さんからの指示があるとき" if has_instruction else "### 定期サイクル（指示なし）"}
@@ -351,8 +356,7 @@ def execute_full_cycle(
 1. ゴール/アクション詳細ページ下部にあるコメント欄を探す
 2. `find` で `@でメンション` を含むtextareaを探す
 3. `form_input` でコメントを入力する（甲原さんへの確認は先頭に「@甲原海人 」をつける）
-4. `javascript_tool` で送信: `document.querySelector('textarea').dispatchEvent(new KeyboardEvent('keydown', {{key: 'Enter', metaKey: true, bubbles: true}}))`
-   または送信ボタン（➤アイコン）を `find` でクリック
+4. 送信ボタン（➤アイコン）を `find` でクリック（見つからなければ `Master/addness/hinata_chrome_mcp.md` の JavaScript 送信）
 
 **ステップ5: ナレッジを蓄積する**
 - 新しい知見があれば `Master/learning/insights.md` に追記する（既存の内容と重複しないこと）
@@ -383,27 +387,8 @@ def execute_full_cycle(
 
 ## ブラウザ操作（Claude in Chrome MCP）
 
-Chrome が常時起動しており、Claude in Chrome 拡張経由で MCP ツールを使ってブラウザを操作できます。
 **Playwright は使わないこと。全て MCP ツールで操作する。**
-
-### 基本操作
-
-1. **タブ確認**: `mcp__claude-in-chrome__tabs_context_mcp` で現在のタブを確認
-2. **新規タブ作成**: `mcp__claude-in-chrome__tabs_create_mcp` で新しいタブを作成
-3. **ページ遷移**: `mcp__claude-in-chrome__navigate` で URL に遷移
-4. **ページ読み取り**: `mcp__claude-in-chrome__read_page` でページの要素を取得
-5. **クリック/入力**: `mcp__claude-in-chrome__find` で要素を探してクリック・入力
-6. **フォーム入力**: `mcp__claude-in-chrome__form_input` でフォームに値を入力
-7. **JavaScript実行**: `mcp__claude-in-chrome__javascript_tool` でJS実行
-8. **テキスト取得**: `mcp__claude-in-chrome__get_page_text` でページ全文取得
-
-### Addness主要操作
-
-- **ゴールページ遷移**: `navigate` で `{goal_url}` に遷移
-- **AIと相談**: `find` で「AIと相談」ボタンをクリック → 右パネル → 入力欄に `form_input` → 送信 → `read_page` で回答を読む
-- **コメント投稿**: `find` で「@でメンション」を含むtextareaを探す → `form_input` で入力 → 送信（Meta+Enter or ➤ボタン）
-- **アクション新規追加**: `find` で「タイトルを」を含むinputを探す → `form_input` で入力 → Enter
-- **アクション完了**: `find` で✓アイコンをクリック
+MCP ツール一覧・Addness主要操作の手順は `Master/addness/hinata_chrome_mcp.md` を参照（必要なときに読む）。
 
 ## 自己修復（エラー修正が必要な場合のみ）
 
@@ -413,7 +398,7 @@ Chrome が常時起動しており、Claude in Chrome 拡張経由で MCP ツー
 3. `bash {SELF_RESTART_SH} "修正内容の説明"` で自分を再起動
 """
 
-    logger.info(f"Claude Code フルサイクル開始 (#{cycle_num})")
+    logger.info("Claude Code フルサイクル開始 (#%s)", cycle_num)
     result = _run_claude_with_retry(prompt, timeout_seconds, f"フルサイクル #{cycle_num}")
     return result
 
@@ -494,11 +479,11 @@ def execute_orchestrator_repair(
 
 修復結果を報告してください。"""
 
-    logger.info(f"Orchestrator 修復タスク開始: {task_name} (trigger={trigger})")
+    logger.info("Orchestrator 修復タスク開始: %s (trigger=%s)", task_name, trigger)
     # 修復は --chrome 不要（コード修正が目的）
     result, error = _run_claude(prompt, timeout_seconds, f"修復: {task_name}", use_chrome=False, max_turns=15)
     if error:
-        logger.error(f"Orchestrator 修復失敗: {error}")
+        logger.error("Orchestrator 修復失敗: %s", error)
     return result
 
 
@@ -512,7 +497,7 @@ def execute_self_repair(
 
     Args:
         error_summary: 発生したエラーの要約
-        recent_logs: 直近のログ出力
+        recent_logs: 直近のログ出力（呼び出し側で末尾2000文字に切り詰め済み）
         timeout_seconds: タイムアウト
     Returns:
         修復結果のテキスト。失敗ならNone。
@@ -523,7 +508,7 @@ def execute_self_repair(
 {error_summary}
 
 ## 直近のログ
-{recent_logs[-2000:] if recent_logs else "なし"}
+{recent_logs or "なし"}
 
 ## 修復手順
 
@@ -551,5 +536,5 @@ def execute_self_repair(
     # 自己修復は --chrome 不要（コード修正が目的）
     result, error = _run_claude(prompt, timeout_seconds, "自己修復", use_chrome=False, max_turns=10)
     if error:
-        logger.error(f"自己修復失敗: {error}")
+        logger.error("自己修復失敗: %s", error)
     return result
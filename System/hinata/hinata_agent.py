@@ -15,16 +15,29 @@ hinata_agent.py はタスクキュー監視とサイクル管理のみ。
     → Slack報告
 """
 
+import atexit
+import collections
+import itertools
 import json
 import logging
+import mmap
+import os
+import queue
+import random
 import sys
+import threading
 import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
-import subprocess as _subprocess
+try:
+    import orjson
+except ImportError:  # 未導入なら標準 json で動かす
+    orjson = None
 
+from chrome_control import is_chrome_cdp_healthy, is_chrome_running, restart_chrome, start_chrome
 from claude_executor import execute_full_cycle, execute_self_repair, execute_orchestrator_repair
 from learning import record_action, detect_and_record_feedback
 from slack_comm import send_message, send_report
@@ -35,33 +48,96 @@ CONFIG_PATH = SCRIPT_DIR / "config.json"
 STATE_PATH = SCRIPT_DIR / "state.json"
 TASKS_PATH = SCRIPT_DIR / "hinata_tasks.json"
 LOG_DIR = SCRIPT_DIR / "logs"
-TASK_POLL_INTERVAL = 15
+TASK_POLL_INTERVAL = 15  # watchdog が無いときのポーリング間隔
+WAKE_MAX_WAIT = 300  # watchdog 利用時も最低この間隔では起きる（イベント取りこぼし対策）
 MAX_CONSECUTIVE_ERRORS = 3  # この回数連続エラーで自己修復サイクル発動
+RETRY_BACKOFF_BASE = 60  # 失敗時リトライ待ちの基準秒（失敗ごとに倍）
+RETRY_BACKOFF_CAP = 1800  # リトライ待ちの上限秒
+CLEANUP_INTERVAL = 3600  # 古いタスクの掃除はこの間隔で十分（完了タスクの保持も1時間）
 
 # ---- ロギング ----
+class TailHandler(logging.Handler):
+    """直近のログ行をメモリに保持するハンドラ（自己修復時に hinata.log を読み直さない）。"""
+
+    def __init__(self, capacity: int = 200):
+        super().__init__()
+        self.buf = collections.deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.buf.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+LOG_FORMAT = "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+TAIL_HANDLER = TailHandler()
+TAIL_HANDLER.setFormatter(logging.Formatter(LOG_FORMAT))
+
 LOG_DIR.mkdir(exist_ok=True)
+
+
+def _start_log_listener() -> tuple[logging.Handler, QueueListener]:
+    """stderr / hinata.log への書き込みをバックグラウンドスレッドに逃がす。
+
+    呼び出し側は QueueHandler でキューに積むだけになり、ファイル書き込みを待たない。
+    TailHandler はメモリに積むだけなので直接ぶら下げたままにする。
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    stream_handler = logging.StreamHandler()
+    file_handler = logging.FileHandler(LOG_DIR / "hinata.log", encoding="utf-8")
+    stream_handler.setFormatter(formatter)
+    file_handler.setFormatter(formatter)
+
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    # 書式は下流のハンドラで付けるので、キューにはメッセージ本文だけ積む
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(
+        queue_handler.queue, stream_handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)  # 終了時にキューの残りを書き切る
+    return queue_handler, listener
+
+
+_log_queue_handler, _log_listener = _start_log_listener()
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(LOG_DIR / "hinata.log", encoding="utf-8"),
-    ],
+    format=LOG_FORMAT,
+    handlers=[_log_queue_handler, TAIL_HANDLER],
 )
 logger = logging.getLogger("hinata")
 
 
+# path -> (st_mtime_ns, パース済み dict)。ループごとの再パースを stat 1回に減らす
+_json_cache: dict = {}
+
+
+def _load_json_cached(path: Path) -> Optional[dict]:
+    """JSON を読み込む。mtime が前回と同じならパースせずキャッシュのコピーを返す。
+
+    ファイルが無ければ None。state / config は値がスカラーだけの浅い dict なので
+    呼び出し側が書き換えてもキャッシュが汚れないよう浅いコピーを返す。
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        cached = (mtime_ns, _json_loads(path.read_bytes()))
+        _json_cache[path] = cached
+    return dict(cached[1])
+
+
 def load_config() -> dict:
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    return _load_json_cached(CONFIG_PATH) or {}
 
 
 def load_state() -> dict:
-    if STATE_PATH.exists():
-        with open(STATE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+    state = _load_json_cached(STATE_PATH)
+    if state is not None:
+        return state
     return {
         "cycle_count": 0,
         "last_action": None,
@@ -70,12 +146,67 @@ def load_state() -> dict:
     }
 
 
+_iso_cache = [0, ""]  # [epoch秒, ISO文字列]
+
+
+def _iso_now(now_ts: Optional[float] = None) -> str:
+    """人が読む用の ISO 時刻文字列を返す（同じ秒の間はキャッシュを返す）。
+
+    比較・並べ替えには epoch 秒（*_ts）を使い、ISO 文字列は表示用にだけ残す。
+    """
+    sec = int(time.time() if now_ts is None else now_ts)
+    if sec != _iso_cache[0]:
+        _iso_cache[0] = sec
+        _iso_cache[1] = datetime.fromtimestamp(sec).isoformat()
+    return _iso_cache[1]
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """インデント付き UTF-8 の JSON バイト列（orjson があれば orjson で）。"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _atomic_write_json(path: Path, obj) -> os.stat_result:
+    """JSON をアトミックに書き込む（tmp に書いて fsync → os.replace）。
+
+    fsync しないと電源断時に rename だけ残って中身が空になることがある。
+    書いたファイルの stat を返す。rename 後に stat すると、その間に他プロセス
+    （秘書・Orchestrator）が書いた分を自分の内容と取り違えるので、tmp の fd から取る
+    （rename では inode も mtime も変わらない）。
+    """
+    tmp = path.with_name(path.name + ".tmp")  # 同じディレクトリに置いて rename をアトミックにする
+    with open(tmp, "wb") as f:
+        f.write(_json_dumps(obj))
+        f.flush()
+        os.fsync(f.fileno())
+        st = os.fstat(f.fileno())
+    os.replace(tmp, path)
+    return st
+
+
 def save_state(state: dict):
     """状態をアトミックに保存（tmp → rename で中間状態を防ぐ）"""
-    tmp = STATE_PATH.with_suffix(".tmp")
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
-    tmp.rename(STATE_PATH)
+    st = _atomic_write_json(STATE_PATH, state)
+    # 自分で書いた内容はそのままキャッシュし、次の load_state で読み直さない
+    _json_cache[STATE_PATH] = (st.st_mtime_ns, dict(state))
+
+
+def flush_state(state: dict):
+    """変更印（_dirty）が付いているときだけ保存する。
+
+    変更のたびに save_state せず、state を書き換えたら _dirty を立てておき、
+    ループの区切りでまとめて1回だけ書き込む。
+    """
+    if state.pop("_dirty", False):
+        save_state(state)
 
 
 def get_interval(config: dict) -> int:
@@ -97,92 +228,6 @@ def get_pause_reason(config: dict) -> str:
 # Chrome 死活監視
 # ====================================================================
 
-CHROME_PROFILE_DIR = Path.home() / "agents" / "System" / "data" / "hinata_chrome_profile"
-
-
-def is_chrome_running() -> bool:
-    """Chrome プロセスが起動しているか確認する。"""
-    try:
-        result = _subprocess.run(
-            ["pgrep", "-f", "Google Chrome"],
-            capture_output=True, text=True, timeout=5,
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
-
-
-def is_chrome_cdp_healthy() -> bool:
-    """Chrome DevTools Protocol (CDP) ポート 9223 が応答するか確認する。
-
-    プロセスが生きていても MCP 接続が死んでいるケースを検知する。
-    """
-    try:
-        result = _subprocess.run(
-            ["curl", "-s", "-o", "/dev/null", "-w", "%{http_code}",
-             "--connect-timeout", "3", "--max-time", "5",
-             "http://localhost:9223/json/version"],
-            capture_output=True, text=True, timeout=10,
-        )
-        status_code = result.stdout.strip()
-        if status_code == "200":
-            return True
-        logger.warning(f"CDP ヘルスチェック失敗: HTTP {status_code}")
-        return False
-    except Exception as e:
-        logger.warning(f"CDP ヘルスチェック例外: {e}")
-        return False
-
-
-def restart_chrome() -> bool:
-    """Chrome を強制終了して再起動する。MCP 接続が不安定な場合に使用。"""
-    logger.warning("Chrome を再起動します...")
-    try:
-        # Chrome を終了（graceful → force）
-        _subprocess.run(["pkill", "-f", "Google Chrome"], timeout=5)
-        time.sleep(3)
-        # まだ残っていたら強制終了
-        if is_chrome_running():
-            _subprocess.run(["pkill", "-9", "-f", "Google Chrome"], timeout=5)
-            time.sleep(2)
-    except Exception as e:
-        logger.warning(f"Chrome 終了時エラー（続行）: {e}")
-
-    # 再起動
-    return _start_chrome()
-
-
-def _start_chrome() -> bool:
-    """Chrome を起動して CDP ポートの疎通を確認する。"""
-    try:
-        _subprocess.Popen(
-            ["open", "-a", "Google Chrome", "--args",
-             f"--user-data-dir={CHROME_PROFILE_DIR}",
-             "--remote-debugging-port=9223",
-             "--no-first-run",
-             "--no-default-browser-check"],
-            stdout=_subprocess.DEVNULL,
-            stderr=_subprocess.DEVNULL,
-        )
-        # Chrome 起動待ち → CDP 疎通確認（最大30秒）
-        for i in range(6):
-            time.sleep(5)
-            if is_chrome_running() and is_chrome_cdp_healthy():
-                logger.info("Chrome 起動成功（CDP 疎通確認済み）")
-                return True
-            logger.info(f"Chrome 起動待ち... ({(i+1)*5}秒)")
-
-        # プロセスはあるが CDP が応答しない
-        if is_chrome_running():
-            logger.warning("Chrome プロセスは起動したが CDP ポートが応答しません")
-            return True  # プロセスはあるので一応 True
-        logger.error("Chrome 起動失敗")
-        return False
-    except Exception as e:
-        logger.error(f"Chrome 起動エラー: {e}")
-        return False
-
-
 def ensure_chrome_running() -> bool:
     """Chrome が正常稼働していなければ起動/再起動する。
 
@@ -193,11 +238,11 @@ def ensure_chrome_running() -> bool:
     """
     if not is_chrome_running():
         logger.warning("Chrome が起動していません。起動を試みます...")
-        ok = _start_chrome()
+        ok = start_chrome()
         if ok:
-            send_message("Chrome が落ちていたので再起動しました。")
+            send_message("Chrome が落ちていたので再起動しました。", blocking=True)
         else:
-            send_message("⚠️ Chrome の起動に失敗しました。手動確認が必要です。")
+            send_message("⚠️ Chrome の起動に失敗しました。手動確認が必要です。", blocking=True)
         return ok
 
     # プロセスはあるが CDP が死んでいないか確認
@@ -205,9 +250,9 @@ def ensure_chrome_running() -> bool:
         logger.warning("Chrome プロセスは存在するが CDP が応答しません。再起動します...")
         ok = restart_chrome()
         if ok:
-            send_message("Chrome の MCP 接続が不安定だったため再起動しました。")
+            send_message("Chrome の MCP 接続が不安定だったため再起動しました。", blocking=True)
         else:
-            send_message("⚠️ Chrome の再起動に失敗しました。手動確認が必要です。")
+            send_message("⚠️ Chrome の再起動に失敗しました。手動確認が必要です。", blocking=True)
         return ok
 
     return True
@@ -217,29 +262,57 @@ def ensure_chrome_running() -> bool:
 # タスクキュー（hinata_tasks.json）
 # ====================================================================
 
-def _load_tasks() -> list:
-    """タスクキューを読み込む。"""
-    if not TASKS_PATH.exists():
-        return []
-    try:
-        with open(TASKS_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return []
+class TaskStore:
+    """hinata_tasks.json をメモリ上に保持するタスクストア。
+
+    Orchestrator も同じファイルを JSON 配列として読み書きするため形式は変えず、
+    mtime/サイズが変わったときだけ再パースする。書き込みは tmp → rename。
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tasks: list = []
+        self._signature = None
+
+    def _stat_signature(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self) -> list:
+        """ファイルが更新されていれば読み直し、タスク一覧を返す。"""
+        signature = self._stat_signature()
+        if signature is None:
+            self.tasks = []
+        elif signature != self._signature:
+            try:
+                self.tasks = _json_loads(self.path.read_bytes())
+            except (ValueError, IOError):
+                self.tasks = []
+                signature = None  # 次回もう一度読み直す
+        self._signature = signature
+        return self.tasks
 
+    def save(self):
+        """タスクキューをアトミックに書き込む。"""
+        st = _atomic_write_json(self.path, self.tasks)
+        self._signature = (st.st_mtime_ns, st.st_size)
 
-def _save_tasks(tasks: list):
-    """タスクキューをアトミックに書き込む。"""
-    tmp = TASKS_PATH.with_suffix(".tmp")
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(tasks, f, ensure_ascii=False, indent=2)
-    tmp.rename(TASKS_PATH)
+    def find(self, task_id: str) -> Optional[dict]:
+        for task in self.load():
+            if task.get("id") == task_id:
+                return task
+        return None
+
+
+_task_store = TaskStore(TASKS_PATH)
 
 
 def check_task_queue() -> Optional[dict]:
     """次のpendingタスクを取得する。"""
-    tasks = _load_tasks()
-    for task in tasks:
+    for task in _task_store.load():
         if task.get("status") == "pending":
             return task
     return None
@@ -247,58 +320,73 @@ def check_task_queue() -> Optional[dict]:
 
 def claim_task(task_id: str):
     """タスクをprocessingに変更する。"""
-    tasks = _load_tasks()
-    for task in tasks:
-        if task.get("id") == task_id:
-            task["status"] = "processing"
-            task["started_at"] = datetime.now().isoformat()
-            break
-    _save_tasks(tasks)
+    task = _task_store.find(task_id)
+    if task is None:
+        return
+    task["status"] = "processing"
+    now_ts = time.time()
+    task["started_at"] = _iso_now(now_ts)
+    task["started_ts"] = now_ts
+    _task_store.save()
 
 
 def complete_task(task_id: str, success: bool, result: str):
     """タスクをcompleted/failedに変更する。"""
-    tasks = _load_tasks()
-    for task in tasks:
-        if task.get("id") == task_id:
-            task["status"] = "completed" if success else "failed"
-            task["completed_at"] = datetime.now().isoformat()
-            task["result"] = result[:500]
-            break
-    _save_tasks(tasks)
+    task = _task_store.find(task_id)
+    if task is None:
+        return
+    task["status"] = "completed" if success else "failed"
+    now_ts = time.time()
+    task["completed_at"] = _iso_now(now_ts)
+    task["completed_ts"] = now_ts
+    task["result"] = result[:500]
+    _task_store.save()
+
+
+def _task_epoch(task: dict, ts_key: str, iso_key: str) -> Optional[float]:
+    """タスクの時刻を epoch 秒で返す。
+
+    epoch がなく ISO 文字列だけのタスク（Orchestrator が書いた created_at 等）は
+    一度だけパースして ts_key に保持し、以降は数値比較だけで済ませる。
+    """
+    ts = task.get(ts_key)
+    if ts is None:
+        iso = task.get(iso_key, "")
+        if not iso:
+            return None
+        try:
+            ts = datetime.fromisoformat(iso).timestamp()
+        except ValueError:
+            return None
+        task[ts_key] = ts
+    return ts
 
 
 def cleanup_old_tasks():
     """完了から1時間以上経ったタスク + 24時間以上放置されたpending/processingタスクを削除する。"""
-    tasks = _load_tasks()
-    now = datetime.now()
+    tasks = _task_store.load()
+    now_ts = time.time()
     kept = []
     for task in tasks:
         status = task.get("status", "")
         # 完了/失敗タスク → 1時間で削除
         if status in ("completed", "failed"):
-            completed_at = task.get("completed_at", "")
-            if completed_at:
-                try:
-                    dt = datetime.fromisoformat(completed_at)
-                    if (now - dt).total_seconds() > 3600:
-                        continue
-                except ValueError:
-                    pass
+            completed_ts = _task_epoch(task, "completed_ts", "completed_at")
+            if completed_ts is not None and now_ts - completed_ts > 3600:
+                continue
         # pending/processing が24時間以上 → 孤立タスクとして削除
         elif status in ("pending", "processing"):
-            created_at = task.get("created_at", "") or task.get("started_at", "")
-            if created_at:
-                try:
-                    dt = datetime.fromisoformat(created_at)
-                    if (now - dt).total_seconds() > 86400:
-                        logger.warning(f"孤立タスク削除: {task.get('id')} ({task.get('instruction', '')[:30]})")
-                        continue
-                except ValueError:
-                    pass
+            created_ts = (
+                _task_epoch(task, "created_ts", "created_at")
+                or _task_epoch(task, "started_ts", "started_at")
+            )
+            if created_ts is not None and now_ts - created_ts > 86400:
+                logger.warning("孤立タスク削除: %s (%s)", task.get('id'), task.get('instruction', '')[:30])
+                continue
         kept.append(task)
     if len(kept) != len(tasks):
-        _save_tasks(kept)
+        _task_store.tasks = kept
+        _task_store.save()
 
 
 # ====================================================================
@@ -308,14 +396,14 @@ def cleanup_old_tasks():
 def run_cycle(config: dict, state: dict, instruction: str = None) -> dict:
     """Claude Codeにフルサイクルを任せる。失敗時はExceptionをraiseする。"""
     cycle_num = state.get("cycle_count", 0) + 1
-    logger.info(f"===== サイクル #{cycle_num} 開始 =====")
+    logger.info("===== サイクル #%s 開始 =====", cycle_num)
 
     # フィードバック検出（指示が直前アクションへの修正かを判定）
     if instruction:
         feedback = detect_and_record_feedback(instruction)
         if feedback:
             sentiment = feedback["sentiment"]
-            logger.info(f"フィードバック検出: [{sentiment}] {instruction[:50]}")
+            logger.info("フィードバック検出: [%s] %s", sentiment, instruction[:50])
 
     my_goal_url = config.get("my_goal_url", "")
     # config の mode を state 経由で claude_executor に渡す
@@ -328,20 +416,21 @@ def run_cycle(config: dict, state: dict, instruction: str = None) -> dict:
     )
 
     state["cycle_count"] = cycle_num
-    state["last_cycle"] = datetime.now().isoformat()
+    state["last_cycle"] = _iso_now()
+    if result:
+        state["last_action"] = result[:200]
+    # 成功・失敗どちらでも保存は呼び出し側の flush_state でまとめて行う
+    state["_dirty"] = True
 
     if result:
-        logger.info(f"サイクル #{cycle_num} 完了")
+        logger.info("サイクル #%s 完了", cycle_num)
         # 親プロセスが確実にアクション記録（Claude Code に任せない）
         record_action(cycle_num, instruction, result, goal_url=my_goal_url)
         send_report(f"サイクル #{cycle_num} 完了", result[:500])
-        state["last_action"] = result[:200]
-        save_state(state)
         return state
     else:
-        logger.warning(f"サイクル #{cycle_num} 失敗（--chrome + リトライ両方失敗）")
+        logger.warning("サイクル #%s 失敗（--chrome + リトライ両方失敗）", cycle_num)
         record_action(cycle_num, instruction, "失敗: Claude Codeが結果を返さなかった（chrome + リトライ済み）")
-        save_state(state)
         raise RuntimeError(f"サイクル #{cycle_num} でClaude Codeが結果を返しませんでした")
 
 
@@ -349,25 +438,56 @@ def run_cycle(config: dict, state: dict, instruction: str = None) -> dict:
 # エラー自動修復
 # ====================================================================
 
-def _read_recent_logs(n_lines: int = 50) -> str:
-    """hinata.log の直近N行を読み込む。"""
-    log_file = LOG_DIR / "hinata.log"
-    if not log_file.exists():
-        return ""
+def _read_recent_logs(n_lines: int = 50, max_chars: int = 2000) -> str:
+    """直近N行のログを返す（末尾 max_chars 文字まで）。
+
+    通常は TailHandler のメモリバッファから返し、
+    再起動直後などバッファが空のときだけ hinata.log を読む。
+    """
+    if TAIL_HANDLER.buf:
+        buf = TAIL_HANDLER.buf
+        # deque 全体を list 化せず、末尾 n_lines だけを辿る
+        text = "\n".join(itertools.islice(buf, max(0, len(buf) - n_lines), None))
+    else:
+        try:
+            text = _tail_file(LOG_DIR / "hinata.log", n_lines)
+        except Exception:
+            return ""
+    return text[-max_chars:]
+
+
+def _tail_file(path: Path, n_lines: int) -> str:
+    """ファイル末尾から N 行を読む（全体は読まない）。
+
+    mmap して末尾から改行を rfind で辿り、必要な末尾部分だけを bytes 化する。
+    """
     try:
-        lines = log_file.read_text(encoding="utf-8").splitlines()
-        return "\n".join(lines[-n_lines:])
-    except Exception:
+        f = open(path, "rb")
+    except FileNotFoundError:
         return ""
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""  # 空ファイルは mmap できない
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            if mm[end - 1:end] == b"\n":
+                end -= 1  # 末尾の改行は行数に数えない
+            pos = end
+            for _ in range(n_lines):
+                pos = mm.rfind(b"\n", 0, pos)
+                if pos < 0:
+                    break
+            return mm[pos + 1:end].decode("utf-8", errors="ignore")
 
 
 def attempt_self_repair(error_summary: str, state: dict) -> bool:
     """自己修復サイクルを実行する。"""
-    logger.warning(f"自己修復サイクル開始: {error_summary}")
+    logger.warning("自己修復サイクル開始: %s", error_summary)
     send_message(
         f"🔧 *自己修復モード起動*\n\n"
         f"連続エラーが{MAX_CONSECUTIVE_ERRORS}回発生したため、自動でバグ修正を試みます。\n"
-        f"エラー: {error_summary[:200]}"
+        f"エラー: {error_summary[:200]}",
+        blocking=True
     )
 
     recent_logs = _read_recent_logs(80)
@@ -377,16 +497,18 @@ def attempt_self_repair(error_summary: str, state: dict) -> bool:
         if "修復不可" in result:
             send_message(
                 f"⚠️ *自己修復断念*\n\n{result[:500]}\n\n"
-                f"甲原さんの確認が必要です。"
+                f"甲原さんの確認が必要です。",
+                blocking=True
             )
             return False
         else:
-            send_message(f"✅ *自己修復完了*\n\n{result[:500]}")
+            send_message(f"✅ *自己修復完了*\n\n{result[:500]}", blocking=True)
             return True
     else:
         send_message(
             "❌ *自己修復失敗*\n\n"
-            "Claude Code による修復が失敗しました。甲原さんの確認が必要です。"
+            "Claude Code による修復が失敗しました。甲原さんの確認が必要です。",
+            blocking=True
         )
         return False
 
@@ -404,7 +526,7 @@ def handle_task(task: dict, config: dict, state: dict) -> dict:
     if command_type == "stop":
         logger.info("秘書からの停止指示")
         state["paused"] = True
-        save_state(state)
+        state["_dirty"] = True
         complete_task(task_id, True, "停止しました")
         return state
 
@@ -413,20 +535,20 @@ def handle_task(task: dict, config: dict, state: dict) -> dict:
         if config.get("paused"):
             reason = get_pause_reason(config)
             state["paused"] = True
-            save_state(state)
+            state["_dirty"] = True
             send_message(f"再開指示を受けましたが、現在は停止方針のため再開しません。{reason}")
             complete_task(task_id, False, f"停止方針のため未再開: {reason}")
             return state
 
         state["paused"] = False
-        save_state(state)
+        state["_dirty"] = True
         send_message("再開します！")
         complete_task(task_id, True, "再開しました")
         return state
 
     elif command_type == "repair":
         claim_task(task_id)
-        logger.info(f"Orchestrator からの修復タスク: {text[:100]}")
+        logger.info("Orchestrator からの修復タスク: %s", text[:100])
         try:
             diagnosis = json.loads(text)
         except (json.JSONDecodeError, TypeError):
@@ -438,24 +560,28 @@ def handle_task(task: dict, config: dict, state: dict) -> dict:
                 if "修復不可" in result:
                     send_message(
                         f"⚠️ *修復断念*: {diagnosis.get('task_name', '不明')}\n\n"
-                        f"{result[:400]}\n\n甲原さんの確認が必要です。"
+                        f"{result[:400]}\n\n甲原さんの確認が必要です。",
+                        blocking=True
                     )
                     complete_task(task_id, False, result[:500])
                 else:
                     send_message(
-                        f"✅ *自動修復完了*: {diagnosis.get('task_name', '不明')}\n\n{result[:400]}"
+                        f"✅ *自動修復完了*: {diagnosis.get('task_name', '不明')}\n\n{result[:400]}",
+                        blocking=True
                     )
                     complete_task(task_id, True, result[:500])
             else:
                 send_message(
                     f"❌ *修復失敗*: {diagnosis.get('task_name', '不明')}\n\n"
-                    f"Claude Code が結果を返しませんでした。甲原さんの確認が必要です。"
+                    f"Claude Code が結果を返しませんでした。甲原さんの確認が必要です。",
+                    blocking=True
                 )
                 complete_task(task_id, False, "Claude Code が結果を返さなかった")
         except Exception as e:
-            logger.error(f"repair タスクエラー: {e}")
+            logger.error("repair タスクエラー: %s", e)
             send_message(
-                f"❌ *修復エラー*: {diagnosis.get('task_name', '不明')}\n{str(e)[:200]}"
+                f"❌ *修復エラー*: {diagnosis.get('task_name', '不明')}\n{str(e)[:200]}",
+                blocking=True
             )
             complete_task(task_id, False, str(e)[:500])
         return state
@@ -465,14 +591,14 @@ def handle_task(task: dict, config: dict, state: dict) -> dict:
         # Chrome が起動していなければ起動
         if not ensure_chrome_running():
             complete_task(task_id, False, "Chrome が起動できませんでした")
-            send_message("⚠️ Chrome が起動できないため、タスクを実行できませんでした。")
+            send_message("⚠️ Chrome が起動できないため、タスクを実行できませんでした。", blocking=True)
             return state
         send_message(f"了解です！「{text[:50]}」に取り組みます。")
         try:
             state = run_cycle(config, state, instruction=text)
             complete_task(task_id, True, state.get("last_action", ""))
         except Exception as e:
-            logger.error(f"instruction タスクエラー: {e}")
+            logger.error("instruction タスクエラー: %s", e)
             complete_task(task_id, False, str(e)[:500])
         return state
 
@@ -483,14 +609,144 @@ def handle_task(task: dict, config: dict, state: dict) -> dict:
 # エントリーポイント
 # ====================================================================
 
+def _start_wake_watcher(wake_event: threading.Event):
+    """タスクキュー・state.json・config.json の変更で wake_event を立てる監視を開始する。
+
+    watchdog が無い環境では None を返し、呼び出し側は従来どおりポーリングする。
+    """
+    try:
+        from watchdog.events import PatternMatchingEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        logger.info("watchdog 未インストールのため %s秒ポーリングで動作します", TASK_POLL_INTERVAL)
+        return None
+
+    class _WakeHandler(PatternMatchingEventHandler):
+        def on_any_event(self, event):
+            wake_event.set()
+
+    # symlink 経由で起動しても FSEvents は実パスで通知してくるため、ファイル名だけで照合する
+    handler = _WakeHandler(
+        patterns=[f"*/{path.name}" for path in (TASKS_PATH, STATE_PATH, CONFIG_PATH)],
+        ignore_directories=True,
+    )
+    observer = Observer()
+    observer.schedule(handler, str(SCRIPT_DIR.resolve()), recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+def _backoff_delay(failures: int) -> float:
+    """失敗回数に応じたリトライ待ち秒（full jitter の指数バックオフ）。
+
+    固定間隔だと Chrome が落ち続けたときに毎回同じタイミングで再試行するので、
+    0〜上限の一様乱数で散らす。
+    """
+    return random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** failures))
+
+
+def _tick(loop: dict):
+    """メインループ1回分の処理（タスクキュー確認 → 定期サイクル → クリーンアップ）。
+
+    loop はループをまたいで持ち越す値（next_cycle_time / consecutive_errors /
+    last_error_summary / chrome_failures / last_cleanup）を保持する dict。
+    config / state は tick の頭で1回だけ読み、変更は最後に1回だけ保存する。
+    """
+    try:
+        config = load_config()
+        # state.json は秘書が paused を変更する可能性があるので毎 tick 読む（mtime キャッシュ経由）
+        state = load_state()
+    except Exception as e:
+        logger.error("設定・状態の読み込みエラー: %s", e)
+        return
+    try:
+        _process_tick(loop, config, state)
+    finally:
+        flush_state(state)
+
+
+def _process_tick(loop: dict, config: dict, state: dict):
+    """_tick の本体。state はその場で書き換え、保存は _tick に任せる。"""
+    # ---- タスクキュー確認 ----
+    try:
+        paused = is_effectively_paused(config, state)
+
+        task = check_task_queue()
+        if task:
+            command_type = task.get("command_type", "instruction")
+
+            if command_type == "stop":
+                handle_task(task, config, state)
+            elif command_type == "resume":
+                handle_task(task, config, state)
+                loop["next_cycle_time"] = time.time() + get_interval(config)
+            elif paused:
+                reason = get_pause_reason(config)
+                logger.info(
+                    "pause 中のため %s タスクを実行しません: %s (%s)",
+                    command_type, task.get('id'), reason,
+                )
+                complete_task(task["id"], False, f"停止中のため未実行: {reason}")
+            else:
+                state = handle_task(task, config, state)
+                loop["next_cycle_time"] = time.time() + get_interval(config)
+                loop["consecutive_errors"] = 0
+    except Exception as e:
+        logger.error("タスク処理エラー: %s", e)
+
+    # ---- 定期サイクル ----
+    if not is_effectively_paused(config, state) and time.time() >= loop["next_cycle_time"]:
+        # Chrome が起動しているか確認（落ちていたら再起動）
+        if not ensure_chrome_running():
+            delay = _backoff_delay(loop["chrome_failures"])
+            loop["chrome_failures"] += 1
+            logger.error("Chrome が起動できないためサイクルをスキップ（%d秒後にリトライ）", delay)
+            loop["next_cycle_time"] = time.time() + delay
+            return
+        loop["chrome_failures"] = 0
+        try:
+            state = run_cycle(config, state)
+            loop["consecutive_errors"] = 0
+        except Exception as e:
+            logger.exception("サイクル実行エラー: %s", e)
+            send_message(f"⚠️ サイクル実行エラー: {str(e)[:200]}", blocking=True)
+            loop["consecutive_errors"] += 1
+            loop["last_error_summary"] = str(e)[:500]
+
+        # ---- 連続エラー時の自己修復 ----
+        if loop["consecutive_errors"] >= MAX_CONSECUTIVE_ERRORS:
+            logger.warning(
+                "連続エラー %d回。自己修復を試みます。", loop["consecutive_errors"]
+            )
+            repaired = attempt_self_repair(loop["last_error_summary"], state)
+            loop["consecutive_errors"] = 0
+            if repaired:
+                logger.info("自己修復完了。次のサイクルで再試行します。")
+
+        interval = get_interval(config)
+        if loop["consecutive_errors"]:
+            # エラー直後は通常間隔を上限にバックオフして早めに再試行する
+            interval = min(interval, _backoff_delay(loop["consecutive_errors"] - 1))
+        loop["next_cycle_time"] = time.time() + interval
+        next_str = datetime.fromtimestamp(loop["next_cycle_time"]).strftime("%H:%M")
+        logger.info("次のサイクル: %s（%d分後）", next_str, interval // 60)
+
+    # ---- 古いタスクのクリーンアップ（1時間に1回） ----
+    now = time.time()
+    if now - loop["last_cleanup"] >= CLEANUP_INTERVAL:
+        cleanup_old_tasks()
+        loop["last_cleanup"] = now
+
+
 def main():
     config = load_config()
     state = load_state()
 
     logger.info("=" * 60)
     logger.info("日向エージェント起動（Claude in Chrome MCP モード）")
-    logger.info(f"サイクル間隔: {config.get('cycle_interval_minutes', 30)}分")
-    logger.info(f"タスク確認間隔: {TASK_POLL_INTERVAL}秒")
+    logger.info("サイクル間隔: %s分", config.get('cycle_interval_minutes', 30))
+    logger.info("タスク確認間隔: %s秒", TASK_POLL_INTERVAL)
     logger.info("=" * 60)
 
     send_message("🌅 日向エージェント起動しました！（Claude in Chrome MCP モード）")
@@ -498,88 +754,38 @@ def main():
     # paused 状態を維持（停止指示後の再起動で勝手に動き出さない）
     if is_effectively_paused(config, state):
         logger.info(
-            "pause 中のため、タスクキュー監視のみ（定期サイクルは停止中）: "
-            f"{get_pause_reason(config)}"
+            "pause 中のため、タスクキュー監視のみ（定期サイクルは停止中）: %s",
+            get_pause_reason(config),
         )
 
-    next_cycle_time = time.time() + get_interval(config)
-    consecutive_errors = 0
-    last_error_summary = ""
+    loop = {
+        "next_cycle_time": time.time() + get_interval(config),
+        "consecutive_errors": 0,
+        "last_error_summary": "",
+        "chrome_failures": 0,
+        "last_cleanup": 0.0,
+    }
+
+    # ファイル変更で起こされるまで眠る。watchdog が無ければ従来どおり一定間隔で起きる
+    wake_event = threading.Event()
+    observer = _start_wake_watcher(wake_event)
+    max_wait = WAKE_MAX_WAIT if observer else TASK_POLL_INTERVAL
 
     try:
         while True:
-            # ---- タスクキュー確認 ----
-            try:
-                config = load_config()
-                # state.json を再読み込み（秘書が paused を変更する可能性）
-                state = load_state()
-                paused = is_effectively_paused(config, state)
-
-                task = check_task_queue()
-                if task:
-                    command_type = task.get("command_type", "instruction")
-
-                    if command_type == "stop":
-                        handle_task(task, config, state)
-                    elif command_type == "resume":
-                        handle_task(task, config, state)
-                        next_cycle_time = time.time() + get_interval(config)
-                    elif paused:
-                        reason = get_pause_reason(config)
-                        logger.info(
-                            f"pause 中のため {command_type} タスクを実行しません: "
-                            f"{task.get('id')} ({reason})"
-                        )
-                        complete_task(task["id"], False, f"停止中のため未実行: {reason}")
-                    else:
-                        state = handle_task(task, config, state)
-                        next_cycle_time = time.time() + get_interval(config)
-                        consecutive_errors = 0
-            except Exception as e:
-                logger.error(f"タスク処理エラー: {e}")
-
-            # ---- 定期サイクル ----
-            config = load_config()
-            state = load_state()  # paused 状態を再確認
-            if not is_effectively_paused(config, state) and time.time() >= next_cycle_time:
-                # Chrome が起動しているか確認（落ちていたら再起動）
-                if not ensure_chrome_running():
-                    logger.error("Chrome が起動できないためサイクルをスキップ")
-                    next_cycle_time = time.time() + 300  # 5分後にリトライ
-                    time.sleep(TASK_POLL_INTERVAL)
-                    continue
-                try:
-                    state = run_cycle(config, state)
-                    consecutive_errors = 0
-                except Exception as e:
-                    logger.exception(f"サイクル実行エラー: {e}")
-                    send_message(f"⚠️ サイクル実行エラー: {str(e)[:200]}")
-                    consecutive_errors += 1
-                    last_error_summary = str(e)[:500]
-
-                # ---- 連続エラー時の自己修復 ----
-                if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
-                    logger.warning(
-                        f"連続エラー {consecutive_errors}回。自己修復を試みます。"
-                    )
-                    repaired = attempt_self_repair(last_error_summary, state)
-                    consecutive_errors = 0
-                    if repaired:
-                        logger.info("自己修復完了。次のサイクルで再試行します。")
-
-                interval = get_interval(config)
-                next_cycle_time = time.time() + interval
-                next_str = datetime.fromtimestamp(next_cycle_time).strftime("%H:%M")
-                logger.info(f"次のサイクル: {next_str}（{interval // 60}分後）")
-
-            # ---- 古いタスクのクリーンアップ（たまに） ----
-            cleanup_old_tasks()
+            # tick の前に下ろす。tick 中・tick 後に来た通知は次の wait を即座に返す
+            wake_event.clear()
+            _tick(loop)
 
-            time.sleep(TASK_POLL_INTERVAL)
+            delta = loop["next_cycle_time"] - time.time()
+            wake_event.wait(timeout=min(max_wait, delta) if delta > 0 else max_wait)
 
     except KeyboardInterrupt:
         logger.info("日向エージェント停止（手動停止）")
-        send_message("👋 日向エージェント停止しました。")
+        send_message("👋 日向エージェント停止しました。", blocking=True)
+    finally:
+        if observer:
+            observer.stop()
 
 
 if __name__ == "__main__":
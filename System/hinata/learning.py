@@ -8,13 +8,21 @@
 - 記憶の統合: 定期的にフィードバックからパターンを抽出
 """
 
+import hashlib
 import json
 import logging
 import os
+import re
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # 未導入なら標準 json で動かす
+    orjson = None
+
 logger = logging.getLogger("hinata.learning")
 
 # ---- パス設定 ----
@@ -141,22 +149,17 @@ def record_action(
     """
     LEARNING_DIR.mkdir(parents=True, exist_ok=True)
 
+    now_ts = time.time()
     entry = {
-        "date": datetime.now().strftime("%Y/%m/%d %H:%M"),
+        "date": datetime.fromtimestamp(now_ts).strftime("%Y/%m/%d %H:%M"),
+        "ts_epoch": int(now_ts),  # 経過時間の判定用（date は表示用）
         "cycle": cycle_num,
         "instruction": (instruction or "定期サイクル")[:200],
         "result": (result or "結果なし")[:500],
         "goal_url": goal_url,
     }
 
-    logs = _load_json(ACTION_LOG_PATH, [])
-    logs.append(entry)
-
-    # 古いエントリを削除
-    if len(logs) > MAX_ACTION_LOG:
-        logs = logs[-MAX_ACTION_LOG:]
-
-    _save_json(ACTION_LOG_PATH, logs)
+    _append_log(ACTION_LOG_PATH, entry, MAX_ACTION_LOG)
     logger.info(f"アクション記録: #{cycle_num} {entry['instruction'][:50]}")
 
 
@@ -169,20 +172,22 @@ def detect_and_record_feedback(new_instruction: str) -> Optional[dict]:
     新しい指示が、直前のアクションへのフィードバックかを判定する。
     フィードバックなら feedback_log.json に記録し、フィードバック情報を返す。
     """
-    logs = _load_json(ACTION_LOG_PATH, [])
+    logs = _load_log(ACTION_LOG_PATH)
     if not logs:
         return None
 
     last_action = logs[-1]
 
-    # 直前のアクションから30分以内かチェック
-    try:
-        last_time = datetime.strptime(last_action["date"], "%Y/%m/%d %H:%M")
-        minutes_since = (datetime.now() - last_time).total_seconds() / 60
-        if minutes_since > 60:
-            return None  # 1時間以上前なら無関係
-    except (ValueError, KeyError):
-        pass
+    # 直前のアクションから1時間以内かチェック
+    last_ts = last_action.get("ts_epoch")
+    if last_ts is None:
+        # ts_epoch を持たない古いエントリは date 文字列から求める
+        try:
+            last_ts = datetime.strptime(last_action["date"], "%Y/%m/%d %H:%M").timestamp()
+        except (ValueError, KeyError):
+            last_ts = None
+    if last_ts is not None and time.time() - last_ts > 3600:
+        return None  # 1時間以上前なら無関係
 
     # フィードバックの種類を判定
     sentiment = _classify_sentiment(new_instruction)
@@ -198,28 +203,39 @@ def detect_and_record_feedback(new_instruction: str) -> Optional[dict]:
     }
 
     # feedback_log に追加
-    feedbacks = _load_json(FEEDBACK_LOG_PATH, [])
-    feedbacks.append(feedback)
-    if len(feedbacks) > MAX_FEEDBACK_LOG:
-        feedbacks = feedbacks[-MAX_FEEDBACK_LOG:]
-    _save_json(FEEDBACK_LOG_PATH, feedbacks)
+    _append_log(FEEDBACK_LOG_PATH, feedback, MAX_FEEDBACK_LOG)
 
     logger.info(f"フィードバック記録: [{sentiment}] {new_instruction[:50]}")
     return feedback
 
 
-def _classify_sentiment(text: str) -> str:
-    """テキストからフィードバックの感情を判定する。"""
-    text_lower = text.lower()
+def _compile_keywords(keywords: list[str]) -> re.Pattern:
+    """キーワード群を1本の正規表現にまとめる。
+
+    英字キーワード（OK / NG / good）は大文字小文字を区別せず、
+    "token" や "string" の一部に誤マッチしないよう前後が英字でないことを条件にする。
+    """
+    parts = []
+    for kw in keywords:
+        if kw.isascii():
+            parts.append(f"(?<![A-Za-z]){re.escape(kw)}(?![A-Za-z])")
+        else:
+            parts.append(re.escape(kw))
+    return re.compile("|".join(parts), re.IGNORECASE)
+
 
-    for kw in _NEGATIVE_KEYWORDS:
-        if kw in text_lower:
-            return "negative"
+_NEGATIVE_RE = _compile_keywords(_NEGATIVE_KEYWORDS)
+_POSITIVE_RE = _compile_keywords(_POSITIVE_KEYWORDS)
 
-    for kw in _POSITIVE_KEYWORDS:
-        if kw in text_lower:
-            return "positive"
 
+def _classify_sentiment(text: str) -> str:
+    """テキストからフィードバックの感情を判定する。"""
+    if not text or len(text) < 2:
+        return "neutral"  # 最短のキーワード（OK / NG）より短い
+    if _NEGATIVE_RE.search(text):
+        return "negative"
+    if _POSITIVE_RE.search(text):
+        return "positive"
     return "neutral"
 
 
@@ -230,16 +246,37 @@ def _classify_sentiment(text: str) -> str:
 def build_learning_context() -> str:
     """
     Claude Code のプロンプトに注入する学習コンテキストを構築する。
+    静的部分と動的部分をつなげたもの（build_learning_context_parts を参照）。
+    """
+    static_text, dynamic_text = build_learning_context_parts()
+    return static_text + dynamic_text
+
+
+def build_learning_context_parts() -> tuple[str, str]:
+    """
+    学習コンテキストを (静的部分, 動的部分) に分けて返す。
+
+    静的部分はサイクルをまたいでほぼ変わらないので、プロンプトの前方に置いて
+    プレフィックスを再利用できるようにする。動的部分は毎サイクル変わる。
+
+    静的:
     - 甲原さんの行動ルール（execution_rules.json）
     - 日向の判断原則（manager_principles.md）
     - アドネス各領域の知見（domain_knowledge.md）
     - 共有OSと会社運用コンテキスト（正本から動的読み込み）
-    - 直近のアクション履歴（5件）
-    - 直近のフィードバック（5件）
     - 蓄積された記憶（hinata_memory.md）
     - insights.md の知見
+    動的:
+    - 直近のアクション履歴（5件）
+    - 直近のフィードバック（5件）
+
+    元ファイルの mtime がどれも変わっていなければ前回組み立てた結果を返す。
     """
-    sections = []
+    key = _context_mtime_key()
+    if key == _context_cache["key"]:
+        return _context_cache["value"]
+
+    static_sections = []
 
     # 0. 甲原さんの行動ルール（最上位 — 全ての判断に適用）
     rules = _load_json(EXECUTION_RULES_PATH, [])
@@ -249,7 +286,7 @@ def build_learning_context() -> str:
             rules_lines.append(
                 f"- 【{r.get('situation', '?')}】→ {r.get('action', '?')}"
             )
-        sections.append(
+        static_sections.append(
             "### 甲原さんの行動ルール（全ての判断に適用すること）\n"
             + "\n".join(rules_lines)
         )
@@ -257,54 +294,92 @@ def build_learning_context() -> str:
     # 1. 日向専用の判断原則
     manager_text = _load_text(MANAGER_PRINCIPLES_PATH, max_chars=2500)
     if manager_text:
-        sections.append(f"### 日向の判断原則\n{manager_text}")
+        static_sections.append(f"### 日向の判断原則\n{manager_text}")
 
     # 2. 会社の各領域知見
     domain_text = _load_text(DOMAIN_KNOWLEDGE_PATH, max_chars=3000)
     if domain_text:
-        sections.append(f"### アドネス各領域の知見\n{domain_text}")
+        static_sections.append(f"### アドネス各領域の知見\n{domain_text}")
 
     # 3. 共有OSと会社運用コンテキスト
     shared_context_text = _build_shared_operating_context()
     if shared_context_text:
-        sections.append(shared_context_text)
+        static_sections.append(shared_context_text)
+
+    # 4. 蓄積された記憶
+    memory_text = _load_text(MEMORY_PATH, max_chars=2000)
+    if memory_text:
+        static_sections.append(f"### 学んだこと（記憶）\n{memory_text}")
+
+    # 5. insights.md
+    insights_text = _load_text(INSIGHTS_PATH, max_chars=1000)
+    if insights_text:
+        static_sections.append(f"### 業務の知見\n{insights_text}")
+
+    dynamic_sections = []
 
-    # 4. 直近のアクション履歴
+    # 6. 直近のアクション履歴
     actions_text = _format_recent_actions(5)
     if actions_text:
-        sections.append(f"### 直近のアクション履歴\n{actions_text}")
+        dynamic_sections.append(f"### 直近のアクション履歴\n{actions_text}")
 
-    # 5. 直近のフィードバック（最重要）
+    # 7. 直近のフィードバック（最重要）
     feedback_text = _format_recent_feedback(5)
     if feedback_text:
-        sections.append(
+        dynamic_sections.append(
             f"### 甲原さんからのフィードバック（必ず反映すること）\n{feedback_text}"
         )
 
-    # 6. 蓄積された記憶
-    memory_text = _load_text(MEMORY_PATH, max_chars=2000)
-    if memory_text:
-        sections.append(f"### 学んだこと（記憶）\n{memory_text}")
+    static_text = ""
+    if static_sections:
+        static_text = (
+            "\n## 過去の学習コンテキスト\n\n"
+            "以下はあなたの過去の経験です。行動ルールに従い、同じ失敗を繰り返さず、"
+            "フィードバックを必ず反映してください。\n\n"
+            + "\n\n".join(static_sections) + "\n"
+        )
+    dynamic_text = ""
+    if dynamic_sections:
+        dynamic_text = (
+            "\n## 直近の経験\n\n"
+            + "\n\n".join(dynamic_sections) + "\n"
+        )
+    _context_cache["key"] = key
+    _context_cache["value"] = (static_text, dynamic_text)
+    return static_text, dynamic_text
 
-    # 7. insights.md
-    insights_text = _load_text(INSIGHTS_PATH, max_chars=1000)
-    if insights_text:
-        sections.append(f"### 業務の知見\n{insights_text}")
 
-    if not sections:
-        return ""
+# build_learning_context_parts の結果キャッシュ（key は元ファイル群の mtime タプル）
+_context_cache: dict = {"key": None, "value": ("", "")}
 
-    header = (
-        "\n## 過去の学習コンテキスト\n\n"
-        "以下はあなたの過去の経験です。行動ルールに従い、同じ失敗を繰り返さず、"
-        "フィードバックを必ず反映してください。\n\n"
-    )
-    return header + "\n\n".join(sections) + "\n"
+
+def _context_source_paths() -> list[Path]:
+    """学習コンテキストの元になるファイル一覧。"""
+    return [
+        EXECUTION_RULES_PATH,
+        MANAGER_PRINCIPLES_PATH,
+        DOMAIN_KNOWLEDGE_PATH,
+        MEMORY_PATH,
+        INSIGHTS_PATH,
+        ACTION_LOG_PATH,
+        FEEDBACK_LOG_PATH,
+    ] + [source["path"] for source in SHARED_OPERATING_CONTEXT_SOURCES]
+
+
+def _context_mtime_key() -> tuple:
+    """元ファイル群の mtime_ns をまとめたキー（存在しないファイルは 0）。"""
+    key = []
+    for path in _context_source_paths():
+        try:
+            key.append(path.stat().st_mtime_ns)
+        except OSError:
+            key.append(0)
+    return tuple(key)
 
 
 def _format_recent_actions(n: int) -> str:
     """直近N件のアクション履歴をフォーマットする。"""
-    logs = _load_json(ACTION_LOG_PATH, [])
+    logs = _load_log(ACTION_LOG_PATH)
     if not logs:
         return ""
     recent = logs[-n:]
@@ -320,7 +395,7 @@ def _format_recent_actions(n: int) -> str:
 
 def _format_recent_feedback(n: int) -> str:
     """直近N件のフィードバックをフォーマットする。"""
-    feedbacks = _load_json(FEEDBACK_LOG_PATH, [])
+    feedbacks = _load_log(FEEDBACK_LOG_PATH)
     if not feedbacks:
         return ""
     recent = feedbacks[-n:]
@@ -365,8 +440,8 @@ def consolidate_memory() -> str:
     Orchestrator の週次タスクから呼ばれる想定。
     戻り値は更新内容のサマリー。
     """
-    actions = _load_json(ACTION_LOG_PATH, [])
-    feedbacks = _load_json(FEEDBACK_LOG_PATH, [])
+    actions = _load_log(ACTION_LOG_PATH)
+    feedbacks = _load_log(FEEDBACK_LOG_PATH)
     existing_memory = _load_text(MEMORY_PATH, max_chars=5000)
 
     if not actions and not feedbacks:
@@ -411,8 +486,15 @@ def consolidate_memory() -> str:
         summary_lines.append("")
 
     new_memory = "\n".join(summary_lines)
-    LEARNING_DIR.mkdir(parents=True, exist_ok=True)
-    MEMORY_PATH.write_text(new_memory, encoding="utf-8")
+    # 中身が前回と同じなら書かない（mtime が変わると学習コンテキストのキャッシュも無効になる）
+    try:
+        old_digest = _memory_digest(MEMORY_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, UnicodeDecodeError):
+        old_digest = None
+    if old_digest == _memory_digest(new_memory):
+        logger.info("記憶に変化なし。書き込みスキップ")
+        return "記憶更新: 変更なし"
+    _atomic_write_bytes(MEMORY_PATH, new_memory.encode("utf-8"))
 
     logger.info(f"記憶更新完了: {len(feedbacks)}件のフィードバック反映")
     return f"記憶更新: アクション{len(actions)}件、フィードバック{len(feedbacks)}件を反映"
@@ -424,34 +506,91 @@ def consolidate_memory() -> str:
 
 def _load_json(path: Path, default):
     """JSON ファイルを安全に読み込む。"""
-    if not path.exists():
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return default
+    except IOError as e:
+        logger.warning(f"JSON読み込み失敗 ({path.name}): {e}")
         return default
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    except ValueError as e:
         logger.warning(f"JSON読み込み失敗 ({path.name}): {e}")
         return default
 
 
+def _memory_digest(text: str) -> bytes:
+    """記憶ファイルの内容ハッシュ。毎回変わる「最終更新:」行は比較から外す。"""
+    body = "\n".join(
+        line for line in text.splitlines() if not line.startswith("最終更新:")
+    )
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).digest()
+
+
 def _save_json(path: Path, data):
     """JSON ファイルをアトミックに書き込む。"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    _atomic_write_bytes(path, payload)
+
+
+def _atomic_write_bytes(path: Path, payload: bytes):
+    """tmp に書いて fsync → os.replace。"""
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(".tmp")
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    tmp.rename(path)
+    tmp = path.with_name(path.name + ".tmp")  # 同じディレクトリに置いて rename をアトミックにする
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# path -> (st_mtime_ns, パース済みリスト)。action_log / feedback_log 用
+_log_cache: dict = {}
+
+
+def _load_log(path: Path) -> list:
+    """
+    action_log / feedback_log を読み込む。mtime が変わっていなければ再パースしない。
+    ファイル形式は Orchestrator も読む JSON 配列のまま。戻り値は読み取り専用として扱うこと。
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    cached = _log_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        logs = _load_json(path, [])
+        if not isinstance(logs, list):
+            logs = []
+        cached = (mtime_ns, logs)
+        _log_cache[path] = cached
+    return cached[1]
+
+
+def _append_log(path: Path, entry: dict, max_len: int) -> None:
+    """ログ末尾に1件追加し、max_len 件に切り詰めて保存する。キャッシュも更新する。"""
+    logs = _load_log(path)[-(max_len - 1):] + [entry]
+    _save_json(path, logs)
+    _log_cache[path] = (path.stat().st_mtime_ns, logs)
 
 
 def _load_text(path: Path, max_chars: int = 2000) -> str:
-    """テキストファイルを安全に読み込む。"""
-    if not path.exists():
-        return ""
+    """テキストファイルを安全に読み込む（先頭 max_chars 文字分だけ読む）。"""
     try:
-        text = path.read_text(encoding="utf-8").strip()
+        with open(path, encoding="utf-8") as f:
+            # テキストモードの read(n) は n 文字で止まる。前後の空白分の余裕も見て読む
+            text = f.read(max_chars + 1024).strip()
         if len(text) > max_chars:
             text = text[:max_chars] + "\n... (省略)"
         return text
+    except FileNotFoundError:
+        return ""
     except IOError as e:
         logger.warning(f"テキスト読み込み失敗 ({path.name}): {e}")
         return ""
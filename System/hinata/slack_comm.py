@@ -6,44 +6,174 @@ Slack監視（受信）はOrchestratorの slack_dispatch タスクが担当し
 hinata_tasks.json 経由で日向に指示を渡す。
 """
 
+import atexit
+import collections
+import http.client
 import json
 import logging
 import os
-import urllib.request
+import signal
+import threading
+import urllib.parse
+from typing import Optional
 
 logger = logging.getLogger("hinata.slack")
 
 # 環境変数から読み込み
 _SLACK_WEBHOOK_URL = os.environ.get("SLACK_AI_TEAM_WEBHOOK_URL", "")
 
+# Webhook への接続は使い回す（1タスクで数回送るので毎回の TLS ハンドシェイクを省く）
+_conn: Optional[http.client.HTTPConnection] = None
+_conn_lock = threading.Lock()
 
-def send_message(text: str) -> bool:
-    """#ai-team に日向としてメッセージを送信する。"""
-    if not _SLACK_WEBHOOK_URL:
-        logger.warning("SLACK_AI_TEAM_WEBHOOK_URL が未設定")
-        return False
+# 送信待ちキュー。投稿はバックグラウンドの1スレッドが順番に行い、呼び出し側は待たない。
+# Slack が落ちていても溜まりすぎないよう、溢れたら古いものから捨てる
+_OUTBOX_MAX = 500
+_outbox: collections.deque = collections.deque(maxlen=_OUTBOX_MAX)
+# SIGTERM ハンドラから flush するため、メインスレッドが保持中でも再取得できる RLock にする
+_outbox_cv = threading.Condition(threading.RLock())
+_sending = False
+_worker: Optional[threading.Thread] = None
+_sigterm_installed = False
+
+
+def _post_webhook(payload: bytes) -> int:
+    """Webhook に POST して HTTP ステータスを返す。
+
+    keep-alive 接続がサーバ側で切られていた場合だけ、張り直して1回再送する。
+    """
+    global _conn
+    url = urllib.parse.urlsplit(_SLACK_WEBHOOK_URL)
+    path = url.path + (f"?{url.query}" if url.query else "")
+    with _conn_lock:
+        for attempt in range(2):
+            reused = _conn is not None
+            if _conn is None:
+                conn_cls = (
+                    http.client.HTTPSConnection if url.scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                _conn = conn_cls(url.netloc, timeout=30)
+            try:
+                _conn.request(
+                    "POST", path, body=payload,
+                    headers={"Content-Type": "application/json"},
+                )
+                resp = _conn.getresponse()
+                resp.read()
+                return resp.status
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                _conn.close()
+                _conn = None
+                if not reused or attempt:
+                    raise
+            except Exception:
+                _conn.close()
+                _conn = None
+                raise
 
-    if len(text) > 3000:
-        text = text[:2990] + "\n... (省略)"
 
+def _post_text(text: str) -> bool:
+    """1件を同期で投稿する（送信スレッドから呼ばれる）。"""
     payload = json.dumps({"text": text}).encode("utf-8")
     try:
-        req = urllib.request.Request(
-            _SLACK_WEBHOOK_URL,
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            ok = resp.status == 200
-            if ok:
-                logger.info(f"Slack送信OK: {text[:50]}...")
-            return ok
+        ok = _post_webhook(payload) == 200
+        if ok:
+            logger.info(f"Slack送信OK: {text[:50]}...")
+        return ok
     except Exception as e:
         logger.error(f"Slack送信失敗: {e}")
         return False
 
 
+def _drain_outbox():
+    """送信スレッド本体。キューに積まれた順に投稿する。"""
+    global _sending
+    while True:
+        with _outbox_cv:
+            while not _outbox:
+                _outbox_cv.wait()
+            text, done = _outbox.popleft()
+            _sending = True
+        ok = _post_text(text)
+        with _outbox_cv:
+            _sending = False
+            _outbox_cv.notify_all()
+        if done is not None:
+            done["ok"] = ok
+            done["event"].set()
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    _worker = threading.Thread(target=_drain_outbox, name="slack-sender", daemon=True)
+    _worker.start()
+    # 起動後に登録するので、ログの QueueListener より先に走って残りを送り切る
+    atexit.register(flush, 10)
+    _install_sigterm_flush()
+
+
+def _install_sigterm_flush():
+    """SIGTERM（launchd の停止・self_restart.sh）でも送信待ちを送り切ってから終了する。
+
+    atexit はシグナル終了では走らないため。signal はメインスレッドからしか設定できないので、
+    それ以外から最初に送信された場合は設定しない。
+    """
+    global _sigterm_installed
+    if _sigterm_installed or threading.current_thread() is not threading.main_thread():
+        return
+    _sigterm_installed = True
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def _on_sigterm(signum, frame):
+        flush(10)
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            # 既定動作（終了）。SystemExit にして finally と atexit を走らせる
+            raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    """キューが空になるまで待つ。timeout 内に送り切れたら True。"""
+    with _outbox_cv:
+        return _outbox_cv.wait_for(lambda: not _outbox and not _sending, timeout)
+
+
+def send_message(text: str, blocking: bool = False) -> bool:
+    """#ai-team に日向としてメッセージを送信する。
+
+    既定ではキューに積んですぐ返る（戻り値は積めたかどうか）。
+    blocking=True なら、先に積まれた分も含めて送信が終わるまで待ち、送信結果を返す。
+    """
+    if not _SLACK_WEBHOOK_URL:
+        logger.warning("SLACK_AI_TEAM_WEBHOOK_URL が未設定")
+        return False
+
+    if len(text) > 3000:
+        text = text[:2990] + "\n... (省略)"
+
+    done = {"event": threading.Event(), "ok": False} if blocking else None
+    with _outbox_cv:
+        if len(_outbox) == _OUTBOX_MAX:
+            dropped_text, dropped_done = _outbox.popleft()
+            logger.warning(f"Slack送信キューが満杯のため最も古いメッセージを破棄: {dropped_text[:50]}...")
+            if dropped_done is not None:
+                dropped_done["event"].set()  # 待っている呼び出し側は送信失敗として返す
+        _outbox.append((text, done))
+        _outbox_cv.notify_all()
+        _ensure_worker()
+
+    if done is None:
+        return True
+    done["event"].wait(timeout=60)
+    return done["ok"]
+
+
 def ask_kohara(question: str) -> bool:
     """甲原に確認を求めるメッセージを送信する。"""
     text = f"🙋 *甲原さんに確認*\n\n{question}\n\n_返信をお待ちしています_"
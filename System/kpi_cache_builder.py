@@ -9,11 +9,15 @@ sheets_sync.py が Master/sheets/ に保存したCSVファイルを読み取り
   python3 kpi_cache_builder.py              # kpi_summary.json を生成
   python3 kpi_cache_builder.py --output /path/to/output.json
   python3 kpi_cache_builder.py --check      # キャッシュの鮮度チェックのみ
+  python3 kpi_cache_builder.py --full       # チェックポイントを無視して全CSVを読み直す
 
 CSV → JSON 変換により、Sheets APIが使えない環境でもKPIデータに即座にアクセス可能。
 """
 
 import csv
+import functools
+import hashlib
+import heapq
 import json
 import os
 import sys
@@ -22,6 +26,11 @@ from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # 未導入なら標準 json で動かす
+    orjson = None
+
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 SHEETS_DIR = PROJECT_ROOT / "Master" / "sheets"
@@ -34,17 +43,67 @@ MONTHLY_CSV = SHEETS_DIR / KPI_SHEET_ID / "スキルプラス（月別）.csv"
 REPORT_CSV = SHEETS_DIR / REPORT_SHEET_ID / "日報.csv"
 
 DEFAULT_OUTPUT = SCRIPT_DIR / "data" / "kpi_summary.json"
+# 出力と同じディレクトリに置く、CSVごとの集計結果のチェックポイント
+CHECKPOINT_NAME = ".kpi_cache_state.json"
+# パース・集計ロジック（_parse_num や各 _read_*_csv）を変えたら上げる。古い集計結果を使わない
+CHECKPOINT_VERSION = 1
+
 
+# 数値セルから取り除く記号（1回の translate で消す）
+_NUM_STRIP = str.maketrans("", "", ",¥%")
 
+
+@functools.lru_cache(maxsize=4096)
 def _parse_num(val: str) -> float:
+    # "0" や "" など同じセル値が大量に繰り返されるのでキャッシュする
     if not val:
         return 0
     try:
-        return float(str(val).replace(",", "").replace("¥", "").replace("%", "").strip() or "0")
+        return float(val.translate(_NUM_STRIP).strip() or "0")
     except (ValueError, TypeError):
         return 0
 
 
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_count(val: str):
+    """件数・金額セル用。整数値なら int で返し、集計を int のまま進める。"""
+    num = _parse_num(val)
+    if isinstance(num, float) and num.is_integer():
+        return int(num)
+    return num
+
+
+def _save_json(path: Path, data):
+    """JSON をアトミックに書き込む。
+
+    tmpfile に書いて os.replace するので、読み手が書きかけの JSON を見ることはない。
+    CSV から作り直せるキャッシュなので fsync はしない。
+    """
+    payload = _json_dumps(data)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, str(path))
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
 def _read_monthly_csv() -> list[dict]:
     if not MONTHLY_CSV.exists():
         return []
@@ -52,22 +111,22 @@ def _read_monthly_csv() -> list[dict]:
     results = []
     with open(MONTHLY_CSV, encoding="utf-8-sig") as f:
         reader = csv.reader(f)
-        header = None
+        columns = None  # ヘッダー行で (列番号, 列名) を一度だけ作る
         for row in reader:
             if not row or not row[0]:
                 continue
             if row[0] == "月":
-                header = row
+                columns = tuple(enumerate(row[1:], 1))
                 continue
-            if header and len(row[0]) >= 7 and "-" in row[0]:
+            if columns and len(row[0]) >= 7 and "-" in row[0]:
                 entry = {"month": row[0]}
-                for i, col_name in enumerate(header[1:], 1):
-                    if i < len(row):
+                n = len(row)
+                for i, col_name in columns:
+                    if i < n:
                         raw = row[i]
+                        # % 表記は小数のまま、それ以外（金額・件数）は整数
                         if "%" in raw:
                             entry[col_name] = _parse_num(raw)
-                        elif "¥" in raw or col_name in ("売上", "広告費", "CPA", "CPO", "LTV", "粗利"):
-                            entry[col_name] = int(_parse_num(raw))
                         else:
                             entry[col_name] = int(_parse_num(raw))
                 results.append(entry)
@@ -87,13 +146,20 @@ def _read_daily_csv() -> tuple[list[dict], dict, dict, dict]:
     with open(DAILY_CSV, encoding="utf-8-sig") as f:
         reader = csv.reader(f)
         header = None
-        col_map = {}
         for row in reader:
             if not row or not row[0]:
                 continue
             if row[0] == "日付":
                 header = row
+                # 列位置はヘッダー行で一度だけ解決する
                 col_map = {h: i for i, h in enumerate(row)}
+                media_idx = col_map.get("集客媒体", 2)
+                funnel_idx = col_map.get("ファネル名", 3)
+                metric_cols = tuple(
+                    (key, col_map[key])
+                    for key in ("集客数", "個別予約数", "実施数", "売上", "広告費")
+                    if key in col_map
+                )
                 continue
             if not header:
                 continue
@@ -102,29 +168,32 @@ def _read_daily_csv() -> tuple[list[dict], dict, dict, dict]:
             if len(dt) < 10 or dt[4] != "-":
                 continue
 
-            media_idx = col_map.get("集客媒体", 2)
-            funnel_idx = col_map.get("ファネル名", 3)
-            media = row[media_idx] if media_idx < len(row) else "不明"
-            funnel = row[funnel_idx] if funnel_idx < len(row) else "不明"
+            n = len(row)
+            media = row[media_idx] if media_idx < n else "不明"
+            funnel = row[funnel_idx] if funnel_idx < n else "不明"
             month_key = dt[:7]
             mf_key = f"{media}|{funnel}"
 
-            for key in ("集客数", "個別予約数", "実施数", "売上", "広告費"):
-                idx = col_map.get(key)
-                if idx is not None and idx < len(row):
-                    val = _parse_num(row[idx])
-                    daily_totals[dt][key] += val
-                    monthly_media[month_key][media][key] += val
-                    mf_monthly[month_key][mf_key][key] += val
+            # 数値は1行につき1回だけパースし、4つの集計先にまとめて加算する
+            vals = {key: _parse_count(row[idx]) for key, idx in metric_cols if idx < n}
+            if not vals:
+                continue
+
+            day_acc = daily_totals[dt]
+            media_acc = monthly_media[month_key][media]
+            mf_acc = mf_monthly[month_key][mf_key]
+            for key, val in vals.items():
+                day_acc[key] += val
+                media_acc[key] += val
+                mf_acc[key] += val
 
             # 日別×媒体（集客数・売上・広告費のみ）
             for key in ("集客数", "売上", "広告費"):
-                idx = col_map.get(key)
-                if idx is not None and idx < len(row):
-                    media_daily[dt][media][key] += _parse_num(row[idx])
+                if key in vals:
+                    media_daily[dt][media][key] += vals[key]
 
     # 直近14日の日別合計
-    sorted_dates = sorted(daily_totals.keys(), reverse=True)[:14]
+    sorted_dates = heapq.nlargest(14, daily_totals)
     recent_daily = []
     for dt in sorted_dates:
         d = daily_totals[dt]
@@ -142,7 +211,7 @@ def _read_daily_csv() -> tuple[list[dict], dict, dict, dict]:
 
     # 月別×媒体（直近3ヶ月）
     mbm = {}
-    for mk in sorted(monthly_media.keys(), reverse=True)[:3]:
+    for mk in heapq.nlargest(3, monthly_media):
         mbm[mk] = {}
         for media, vals in monthly_media[mk].items():
             ad = vals["広告費"]
@@ -193,23 +262,25 @@ def _read_report_csv() -> dict:
     if not REPORT_CSV.exists():
         return {}
 
+    # 全行を list 化せず、1パスで「C列ラベル → 最初の行」だけを残す
+    header = []
+    row_map = {}
+    row_count = 0
     with open(REPORT_CSV, encoding="utf-8-sig") as f:
-        reader = csv.reader(f)
-        rows = list(reader)
-
-    if len(rows) < 10:
+        for r in csv.reader(f):
+            if row_count == 0:
+                header = r
+            row_count += 1
+            if len(r) >= 3:
+                key = r[2].strip() if r[2] else ""
+                if key and key not in row_map:
+                    row_map[key] = r
+
+    if row_count < 10:
         return {}
 
-    header = rows[0] if rows else []
     result = {}
 
-    row_map = {}
-    for r in rows:
-        if len(r) >= 3:
-            key = r[2].strip() if r[2] else ""
-            if key and key not in row_map:
-                row_map[key] = r
-
     for label, out_key in [
         ("着金売上（確定ベース）", "着金売上"),
         ("広告費（新井さん集計待ち）", "広告費"),
@@ -239,11 +310,68 @@ def _read_report_csv() -> dict:
     return result
 
 
-def build_cache(output_path: Path = None) -> dict:
-    """CSVからKPIサマリーJSONを構築"""
-    monthly = _read_monthly_csv()
-    recent_daily, monthly_by_media, monthly_by_media_funnel, recent_daily_by_media = _read_daily_csv()
-    report_summary = _read_report_csv()
+def _file_digest(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def _read_with_checkpoint(name: str, path: Path, reader, checkpoint: dict):
+    """CSV が前回から変わっていなければ、チェックポイントの集計結果を返す。
+
+    sheets_sync.py は毎回 CSV を丸ごと書き直すので mtime だけでは判定できない。
+    (mtime, サイズ) が同じならそのまま、違えば内容ハッシュを比べ、
+    中身も変わっていたときだけ reader() でパースし直す。
+    CHECKPOINT_VERSION が違うエントリはパース方法が古いので使わない。
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        checkpoint.pop(name, None)
+        return reader()
+    signature = [st.st_mtime_ns, st.st_size]
+
+    entry = checkpoint.get(name)
+    if entry and entry.get("version") != CHECKPOINT_VERSION:
+        entry = None
+    if entry and entry.get("signature") == signature:
+        return entry["result"]
+    digest = _file_digest(path)
+    if entry and entry.get("digest") == digest:
+        entry["signature"] = signature
+        return entry["result"]
+
+    result = reader()
+    checkpoint[name] = {
+        "version": CHECKPOINT_VERSION,
+        "signature": signature,
+        "digest": digest,
+        "result": result,
+    }
+    return result
+
+
+def _load_checkpoint(path: Path) -> dict:
+    try:
+        data = _json_loads(path.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def build_cache(output_path: Path = None, full: bool = False) -> dict:
+    """CSVからKPIサマリーJSONを構築
+
+    変更のない CSV はパースせず、前回のチェックポイントの集計結果を使う。
+    full=True なら全 CSV を読み直す。
+    """
+    out = output_path or DEFAULT_OUTPUT
+    checkpoint_path = out.parent / CHECKPOINT_NAME
+    checkpoint = {} if full else _load_checkpoint(checkpoint_path)
+
+    monthly = _read_with_checkpoint("monthly", MONTHLY_CSV, _read_monthly_csv, checkpoint)
+    recent_daily, monthly_by_media, monthly_by_media_funnel, recent_daily_by_media = (
+        _read_with_checkpoint("daily", DAILY_CSV, _read_daily_csv, checkpoint)
+    )
+    report_summary = _read_with_checkpoint("report", REPORT_CSV, _read_report_csv, checkpoint)
 
     # バリデーション: 空データチェック
     if not monthly and not recent_daily:
@@ -261,20 +389,8 @@ def build_cache(output_path: Path = None) -> dict:
         "source": "csv_cache",
     }
 
-    out = output_path or DEFAULT_OUTPUT
-    out.parent.mkdir(parents=True, exist_ok=True)
-
-    # アトミック書き込み: tmpfile → rename で破損を防止
-    json_str = json.dumps(cache, ensure_ascii=False, indent=2)
-    fd, tmp_path = tempfile.mkstemp(dir=out.parent, suffix=".tmp")
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            f.write(json_str)
-        os.replace(tmp_path, str(out))
-    except Exception:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-        raise
+    _save_json(out, cache)
+    _save_json(checkpoint_path, checkpoint)
 
     print(f"✅ KPIキャッシュ生成完了: {out}")
     print(f"   月別: {len(monthly)}ヶ月 / 日別: {len(recent_daily)}日 / 媒体別: {len(monthly_by_media)}ヶ月")
@@ -292,7 +408,7 @@ def check_cache(output_path: Path = None) -> bool:
         print("❌ キャッシュファイルなし")
         return False
     try:
-        cache = json.loads(out.read_text(encoding="utf-8"))
+        cache = _json_loads(out.read_bytes())
         updated = datetime.fromisoformat(cache.get("updated_at", "2000-01-01"))
         age_hours = (datetime.now() - updated).total_seconds() / 3600
         if age_hours < 24:
@@ -318,4 +434,4 @@ if __name__ == "__main__":
         for i, a in enumerate(sys.argv):
             if a == "--output" and i + 1 < len(sys.argv):
                 output = Path(sys.argv[i + 1])
-        build_cache(output)
+        build_cache(output, full="--full" in sys.argv)
@@ -17,7 +17,9 @@ refresh: 日別タブの既存データから月別タブを再計算
   スキルプラス（月別）  → 月別合計KPI（1行/月）
 """
 
+import bisect
 import csv
+import functools
 import sys
 import os
 from datetime import date, datetime, timedelta
@@ -45,13 +47,24 @@ SUM_COLS = ["集客数", "個別予約数", "実施数", "売上", "広告費"]
 # 月別タブの表示カラム
 MONTHLY_KPI_COLS = ["集客数", "個別予約数", "実施数", "売上", "広告費", "CPA", "CPO", "ROAS", "LTV", "粗利"]
 
+# 各タブの列数（書き込み・中央揃えの範囲）
+_DAILY_COL_COUNT = len(DAILY_HEADER)            # A〜M
+_MONTHLY_COL_COUNT = len(MONTHLY_KPI_COLS) + 1  # A〜K（月 + KPI列）
+_LOG_COL_COUNT = len(LOG_HEADER)                # A〜D
 
+
+# _parse_num で除去する記号（¥・カンマ・%）
+_NUM_STRIP = str.maketrans("", "", ",¥%")
+
+
+@functools.lru_cache(maxsize=4096)
 def _parse_num(val):
     """文字列を数値に変換（¥・カンマ・%を除去、空やエラーは0）"""
+    # 月別再計算では "¥0" など同じセル値が大量に繰り返されるのでキャッシュする
     if not val:
         return 0
     try:
-        cleaned = str(val).replace(",", "").replace("¥", "").replace("%", "").strip()
+        cleaned = str(val).translate(_NUM_STRIP).strip()
         return float(cleaned) if cleaned else 0
     except ValueError:
         return 0
@@ -75,7 +88,8 @@ def _calc_derived(d):
 def _fmt_num(val):
     """数値をカンマ区切りにフォーマット（4桁以上）"""
     try:
-        n = float(str(val).replace(",", ""))
+        # 計算結果の数値はそのまま使い、文字列だけカンマを除去して変換する
+        n = val if isinstance(val, (int, float)) else float(str(val).replace(",", ""))
         if n == int(n):
             return f"{int(n):,}"
         return f"{round(n, 1):,}"
@@ -86,7 +100,7 @@ def _fmt_num(val):
 def _fmt_yen(val):
     """円表記: ¥1,234,567"""
     try:
-        n = float(str(val).replace(",", ""))
+        n = val if isinstance(val, (int, float)) else float(str(val).replace(",", ""))
         return f"¥{int(round(n)):,}" if n else "¥0"
     except (ValueError, TypeError):
         return str(val)
@@ -95,7 +109,7 @@ def _fmt_yen(val):
 def _fmt_pct(val):
     """パーセント表記: 123.4%"""
     try:
-        n = float(str(val).replace(",", ""))
+        n = val if isinstance(val, (int, float)) else float(str(val).replace(",", ""))
         if n == 0:
             return "0%"
         return f"{round(n, 1)}%" if n != int(n) else f"{int(n)}%"
@@ -137,12 +151,167 @@ def _fmt_monthly_val(col_name, val):
     return _fmt_num(val)
 
 
-def _center_align(ws, row_count, col_count):
-    """シート全体を中央揃えにする"""
-    col_letter = chr(ord("A") + col_count - 1)
-    ws.format(f"A1:{col_letter}{row_count}", {
-        "horizontalAlignment": "CENTER",
+def _row_data(rows):
+    """値の2次元リストを updateCells 用の RowData に変換（文字列としてそのまま書く）"""
+    return [
+        {"values": [{"userEnteredValue": {"stringValue": str(v)}} for v in row]}
+        for row in rows
+    ]
+
+
+def _write_cells_request(ws, row_idx, rows):
+    """row_idx 行目（0始まり）のA列から rows を書き込む updateCells リクエスト"""
+    return {
+        "updateCells": {
+            "start": {"sheetId": ws.id, "rowIndex": row_idx, "columnIndex": 0},
+            "rows": _row_data(rows),
+            "fields": "userEnteredValue",
+        }
+    }
+
+
+def _center_request(ws, start_row, end_row, col_count):
+    """[start_row, end_row) 行の A〜col_count 列を中央揃えにする repeatCell リクエスト"""
+    return {
+        "repeatCell": {
+            "range": {
+                "sheetId": ws.id,
+                "startRowIndex": start_row,
+                "endRowIndex": end_row,
+                "startColumnIndex": 0,
+                "endColumnIndex": col_count,
+            },
+            "cell": {"userEnteredFormat": {"horizontalAlignment": "CENTER"}},
+            "fields": "userEnteredFormat.horizontalAlignment",
+        }
+    }
+
+
+def _rewrite_tab(spreadsheet, ws, rows, col_count, center=True):
+    """タブ全体を1回の batch_update で書き直す（既存値の消去 + 書き込み + 中央揃え）"""
+    spreadsheet.batch_update({"requests": _rewrite_tab_requests(ws, rows, col_count, center)})
+
+
+def _rewrite_tab_requests(ws, rows, col_count, center=True):
+    requests = []
+    if len(rows) > ws.row_count:
+        requests.append({
+            "appendDimension": {
+                "sheetId": ws.id,
+                "dimension": "ROWS",
+                "length": len(rows) - ws.row_count,
+            }
+        })
+    # range にシート全体を指定すると、rows に含まれないセルの値は消去される（clear() 相当）
+    requests.append({
+        "updateCells": {
+            "range": {"sheetId": ws.id},
+            "rows": _row_data(rows),
+            "fields": "userEnteredValue",
+        }
     })
+    if center:
+        requests.append(_center_request(ws, 0, len(rows), col_count))
+    return requests
+
+
+def _row_date(row):
+    """行の日付（A列）。空行は [] と [''] のどちらでも "" を返す"""
+    return row[0].strip() if row else ""
+
+
+def _dates_descending(rows):
+    """全行に日付があり、日付降順に並んでいるか"""
+    prev = None
+    for row in rows:
+        d = _row_date(row)
+        if not d or (prev is not None and d > prev):
+            return False
+        prev = d
+    return True
+
+
+def _apply_date_rows(spreadsheet, ws, existing, header_row_idx, blocks, col_count,
+                     extra_requests=(), center=False):
+    """同日行の削除と新規行の挿入だけをシートに反映する（全体の書き直しはしない）
+
+    existing はシートの現在値（日付降順）、blocks は [(日付, 行リスト), ...]。
+    行の削除・挿入・値の書き込み（・中央揃え）は1回の batch_update で送る。
+    空行・日付のない行があるか並びが崩れているときは、空行を除いて日付降順に並べ直し、
+    タブ全体を書き直す（同じく1回の batch_update）。
+    戻り値: 反映後の全行
+    """
+    body_start = header_row_idx + 1
+    drop_dates = {d for d, _ in blocks}
+
+    delete_runs = []  # [開始, 終了) の0始まり行番号
+    kept = []
+    for i, row in enumerate(existing[body_start:], start=body_start):
+        if _row_date(row) in drop_dates:
+            if delete_runs and delete_runs[-1][1] == i:
+                delete_runs[-1][1] = i + 1
+            else:
+                delete_runs.append([i, i + 1])
+        else:
+            kept.append(row)
+
+    if not _dates_descending(kept):
+        # 二分探索の前提（全行が日付降順）が成り立たないので全体を書き直す
+        body = [row for row in kept if _row_date(row)]
+        for _, rows in blocks:
+            body.extend(rows)
+        body.sort(key=_row_date, reverse=True)
+        result = existing[:body_start] + body
+        requests = _rewrite_tab_requests(ws, result, col_count, center=center)
+        requests.extend(extra_requests)
+        spreadsheet.batch_update({"requests": requests})
+        return result
+
+    # 日付降順を保つ挿入位置を決めつつ、反映後の全行を組み立てる
+    # kept は日付降順なので「target_date より古い最初の行」を二分探索で求める
+    result = existing[:body_start]
+    inserts = []
+    pos = 0
+    for target_date, rows in sorted(blocks, key=lambda b: b[0], reverse=True):
+        nxt = bisect.bisect_left(kept, True, pos, key=lambda row: _row_date(row) < target_date)
+        result.extend(kept[pos:nxt])
+        pos = nxt
+        inserts.append((len(result), rows))
+        result.extend(rows)
+    result.extend(kept[pos:])
+
+    requests = []
+    for start, end in reversed(delete_runs):
+        requests.append({
+            "deleteDimension": {
+                "range": {
+                    "sheetId": ws.id,
+                    "dimension": "ROWS",
+                    "startIndex": start,
+                    "endIndex": end,
+                }
+            }
+        })
+    for start, rows in inserts:
+        requests.append({
+            "insertDimension": {
+                "range": {
+                    "sheetId": ws.id,
+                    "dimension": "ROWS",
+                    "startIndex": start,
+                    "endIndex": start + len(rows),
+                },
+                # ヘッダー直下に入れるときはヘッダーの書式を引き継がない
+                "inheritFromBefore": start > body_start,
+            }
+        })
+    for start, rows in inserts:
+        requests.append(_write_cells_request(ws, start, rows))
+        if center:
+            requests.append(_center_request(ws, start, start + len(rows), col_count))
+    requests.extend(extra_requests)
+    spreadsheet.batch_update({"requests": requests})
+    return result
 
 
 # ─── CSV取り込み ──────────────────────────────────────────
@@ -158,41 +327,44 @@ def import_csv(csv_path, target_date=None):
 
     csv_filename = os.path.basename(csv_path)
 
-    # CSV読み込み
+    # CSV読み込み（読みながら日付付きでフォーマットし、生の行は保持しない）
     with open(csv_path, encoding="utf-8") as f:
         reader = csv.reader(f)
-        csv_header = next(reader)
-        csv_rows = list(reader)
+        next(reader, None)  # ヘッダースキップ
+        new_rows = [_fmt_daily_row([target_date] + csv_row) for csv_row in reader]
 
-    if not csv_rows:
+    if not new_rows:
         print("エラー: CSVにデータがありません")
         sys.exit(1)
 
-    print(f"CSV読み込み: {len(csv_rows)} 行（対象日付: {target_date}）")
+    print(f"CSV読み込み: {len(new_rows)} 行（対象日付: {target_date}）")
 
     # スプレッドシート接続
     client = sheets_manager.get_client()
     spreadsheet = client.open_by_key(SHEET_ID)
+    now_str = datetime.now().strftime("%Y-%m-%d %H:%M")  # 各タブで同じ時刻を使う
 
     # ─── 日別タブ更新（CSV全行を展開）───
-    _update_daily_tab(spreadsheet, csv_rows, target_date)
+    daily_rows = _update_daily_tab(spreadsheet, new_rows, target_date, now_str)
 
-    # ─── 月別タブ再計算 ───
-    _recalc_monthly(spreadsheet)
+    # ─── 月別タブ再計算（日別タブは再取得しない）───
+    _recalc_monthly(spreadsheet, now_str, daily_rows=daily_rows)
 
     # ─── 元データにログ記録 ───
-    _log_import(spreadsheet, target_date, csv_filename)
+    _log_import(spreadsheet, target_date, csv_filename, now_str)
 
     print("完了")
 
 
-def _update_daily_tab(spreadsheet, csv_rows, target_date):
-    """日別タブにCSVの全行を日付付きで追加（同日データは上書き）"""
+def _update_daily_tab(spreadsheet, new_rows, target_date, now_str):
+    """日別タブにCSVの全行を日付付きで追加（同日データは上書き）
+
+    new_rows: 日付付きでフォーマット済みの行リスト
+    戻り値: 書き込み後の日別タブ全行（月別再計算に渡して再取得を省く）
+    """
     ws_daily = spreadsheet.worksheet(DAILY_TAB)
     existing = ws_daily.get_all_values()
 
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M")
-
     # ヘッダー行を探す（DAILY_HEADERと一致する行）
     header_row_idx = None
     for i, row in enumerate(existing):
@@ -200,56 +372,41 @@ def _update_daily_tab(spreadsheet, csv_rows, target_date):
             header_row_idx = i
             break
 
+    last_updated = [f"最終更新: {now_str}"] + [""] * (_DAILY_COL_COUNT - 1)
+
     if header_row_idx is None:
         # 初回 or ヘッダー不一致: テンプレート再作成（データは保持しない）
-        existing = [
-            ["【スキルプラス】日別データ"] + [""] * (len(DAILY_HEADER) - 1),
-            [f"最終更新: {now_str}"] + [""] * (len(DAILY_HEADER) - 1),
-            [""] * len(DAILY_HEADER),
+        result = [
+            ["【スキルプラス】日別データ"] + [""] * (_DAILY_COL_COUNT - 1),
+            last_updated,
+            [""] * _DAILY_COL_COUNT,
             DAILY_HEADER,
-        ]
+        ] + new_rows
         header_row_idx = 3
-
-    # 既存データから同日を除外
-    kept = existing[:header_row_idx + 1]
-    for row in existing[header_row_idx + 1:]:
-        if row and row[0] != target_date:
-            kept.append(row)
-
-    # 新しいCSV行を日付付きで追加（フォーマット適用）
-    new_rows = []
-    for csv_row in csv_rows:
-        new_rows.append(_fmt_daily_row([target_date] + csv_row))
-
-    # 日付降順で挿入位置を探す
-    result = kept[:header_row_idx + 1]
-    inserted = False
-    for row in kept[header_row_idx + 1:]:
-        if not inserted and row and row[0] < target_date:
-            result.extend(new_rows)
-            inserted = True
-        result.append(row)
-    if not inserted:
-        result.extend(new_rows)
-
-    # 最終更新日時を更新
-    result[1] = [f"最終更新: {now_str}"] + [""] * (len(DAILY_HEADER) - 1)
-
-    # 書き込み
-    col_count = len(DAILY_HEADER)
-    col_letter = chr(ord("A") + col_count - 1)  # M
-    ws_daily.clear()
-    ws_daily.update(values=result, range_name=f"A1:{col_letter}{len(result)}")
-    _center_align(ws_daily, len(result), col_count)
+        _rewrite_tab(spreadsheet, ws_daily, result, _DAILY_COL_COUNT)
+    else:
+        # 同日行の削除と新規行の挿入だけを反映（最終更新日時も同じ呼び出しで書く）
+        result = _apply_date_rows(
+            spreadsheet, ws_daily, existing, header_row_idx,
+            [(target_date, new_rows)], _DAILY_COL_COUNT,
+            extra_requests=[_write_cells_request(ws_daily, 1, [last_updated[:1]])],
+            center=True,
+        )
+        result[1] = last_updated
     print(f"日別タブ更新完了: {target_date} の {len(new_rows)} 行を投入（合計 {len(result) - header_row_idx - 1} 行）")
+    return result
 
 
-def _recalc_monthly(spreadsheet):
-    """日別タブの全データから月別タブを再計算"""
-    ws_daily = spreadsheet.worksheet(DAILY_TAB)
+def _recalc_monthly(spreadsheet, now_str, daily_rows=None):
+    """日別タブの全データから月別タブを再計算
+
+    daily_rows: 直前に書き込んだ日別タブの全行。渡された場合はシートを再取得しない。
+    """
     ws_monthly = spreadsheet.worksheet(MONTHLY_TAB)
 
-    daily_data = ws_daily.get_all_values()
+    if daily_rows is None:
+        daily_rows = spreadsheet.worksheet(DAILY_TAB).get_all_values()
+    daily_data = daily_rows
 
     # ヘッダー行を探す
     header_row_idx = None
@@ -264,37 +421,28 @@ def _recalc_monthly(spreadsheet):
         print("日別タブにデータがありません")
         return
 
-    # 日付×月でまず日別合計を出し、月別に集約
-    # （同じ日付に複数行があるので、まず日別にSUMしてから月別にSUM）
-    daily_totals = defaultdict(lambda: {c: 0 for c in SUM_COLS})
+    # 月ごとに1パスで集計（日別合計→月別合計と同じ結果になる）
+    # 集計列の位置はヘッダーから一度だけ解決し、合計は SUM_COLS 順のリストで持つ
+    sum_idxs = [(k, daily_col_map[c]) for k, c in enumerate(SUM_COLS) if c in daily_col_map]
+    n_cols = len(SUM_COLS)
+    month_totals = defaultdict(lambda: [0] * n_cols)
     for row in daily_data[header_row_idx + 1:]:
         if not row or not row[0]:
             continue
-        dt = row[0]
-        d = daily_totals[dt]
-        for col_name in SUM_COLS:
-            idx = daily_col_map.get(col_name)
-            if idx is not None and idx < len(row):
-                d[col_name] += _parse_num(row[idx])
-
-    # 月別集計
-    monthly = defaultdict(lambda: {c: 0 for c in SUM_COLS})
-    for dt, d in daily_totals.items():
-        month_key = dt[:7]
-        m = monthly[month_key]
-        for col_name in SUM_COLS:
-            m[col_name] += d[col_name]
-
-    for mk, m in monthly.items():
-        _calc_derived(m)
+        totals = month_totals[row[0][:7]]
+        row_len = len(row)
+        for k, idx in sum_idxs:
+            if idx < row_len:
+                totals[k] += _parse_num(row[idx])
+
+    monthly = {mk: _calc_derived(dict(zip(SUM_COLS, totals))) for mk, totals in month_totals.items()}
 
     sorted_months = sorted(monthly.keys(), reverse=True)
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M")
 
     monthly_output = [
-        ["【スキルプラス】月別KPI", "", "", "", "", "", "", "", "", "", ""],
-        [f"最終更新: {now_str}", "", "", "", "", "", "", "", "", "", ""],
-        ["", "", "", "", "", "", "", "", "", "", ""],
+        ["【スキルプラス】月別KPI"] + [""] * (_MONTHLY_COL_COUNT - 1),
+        [f"最終更新: {now_str}"] + [""] * (_MONTHLY_COL_COUNT - 1),
+        [""] * _MONTHLY_COL_COUNT,
         ["月"] + MONTHLY_KPI_COLS,
     ]
     for mk in sorted_months:
@@ -302,43 +450,22 @@ def _recalc_monthly(spreadsheet):
         row = [mk] + [_fmt_monthly_val(col, m[col]) for col in MONTHLY_KPI_COLS]
         monthly_output.append(row)
 
-    ws_monthly.clear()
-    ws_monthly.update(values=monthly_output, range_name=f"A1:K{len(monthly_output)}")
-    _center_align(ws_monthly, len(monthly_output), len(MONTHLY_KPI_COLS) + 1)
+    _rewrite_tab(spreadsheet, ws_monthly, monthly_output, _MONTHLY_COL_COUNT)
     print(f"月別タブ更新完了: {len(sorted_months)} ヶ月分")
 
 
-def _log_import(spreadsheet, target_date, csv_filename):
+def _log_import(spreadsheet, target_date, csv_filename, now_str):
     """元データタブに実行ログを記録"""
     ws_raw = spreadsheet.worksheet(RAW_TAB)
     existing = ws_raw.get_all_values()
 
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M")
+    new_log = [target_date, csv_filename, now_str, "完了"]
 
     if not existing or (existing[0] and existing[0][0] != LOG_HEADER[0]):
-        ws_raw.clear()
-        existing = [LOG_HEADER]
-
-    # 同日の既存ログを除去
-    kept = [existing[0]]
-    for row in existing[1:]:
-        if row and row[0] != target_date:
-            kept.append(row)
-
-    # 新しいログを日付降順で挿入
-    new_log = [target_date, csv_filename, now_str, "完了"]
-    inserted = False
-    result = [kept[0]]
-    for row in kept[1:]:
-        if not inserted and row and row[0] < target_date:
-            result.append(new_log)
-            inserted = True
-        result.append(row)
-    if not inserted:
-        result.append(new_log)
-
-    ws_raw.clear()
-    ws_raw.update(values=result, range_name=f"A1:D{len(result)}")
+        _rewrite_tab(spreadsheet, ws_raw, [LOG_HEADER, new_log], _LOG_COL_COUNT, center=False)
+    else:
+        # 同日の既存ログを削除し、新しいログを日付降順の位置に挿入
+        _apply_date_rows(spreadsheet, ws_raw, existing, 0, [(target_date, [new_log])], _LOG_COL_COUNT)
     print(f"元データ ログ記録完了: {target_date} / {csv_filename}")
 
 
@@ -348,7 +475,7 @@ def refresh():
     """日別タブの既存データから月別タブを再計算"""
     client = sheets_manager.get_client()
     spreadsheet = client.open_by_key(SHEET_ID)
-    _recalc_monthly(spreadsheet)
+    _recalc_monthly(spreadsheet, datetime.now().strftime("%Y-%m-%d %H:%M"))
 
 
 # ─── process（元データ監視 → 日別自動投入）──────────────────
@@ -361,18 +488,15 @@ def process():
     """元データの「完了」エントリを検知 → CSVファイルを日別に投入 → 月別再計算"""
     client = sheets_manager.get_client()
     spreadsheet = client.open_by_key(SHEET_ID)
+    now_str = datetime.now().strftime("%Y-%m-%d %H:%M")  # 各タブで同じ時刻を使う
 
     # ─── 元データから完了リスト取得 ───
     ws_raw = spreadsheet.worksheet(RAW_TAB)
     raw_data = ws_raw.get_all_values()
 
-    # ─── 日別タブから既存日付を取得 ───
+    # ─── 日別タブから既存日付を取得（日付列だけ取得する）───
     ws_daily = spreadsheet.worksheet(DAILY_TAB)
-    daily_data = ws_daily.get_all_values()
-    existing_dates = set()
-    for row in daily_data:
-        if row and row[0] and len(row[0]) == 10 and row[0][4] == "-":
-            existing_dates.add(row[0])
+    existing_dates = {v for v in ws_daily.col_values(1) if len(v) == 10 and v[4] == "-"}
 
     # ─── 完了 かつ 日別未投入 の日付を検出 ───
     pending = []
@@ -391,23 +515,25 @@ def process():
     print(f"投入対象: {len(pending)} 日分")
 
     # ─── CSVファイルを探して日別に一括投入 ───
-    all_new_rows = []  # (date, csv_rows) のリスト
+    all_new_rows = []  # (date, フォーマット済み行) のリスト
     missing_csv = []
 
+    listing = _list_csv_dirs()  # 候補ごとの stat ではなく、ディレクトリを一度だけ読む
     for row_idx, target_date in pending:
         csv_type_name = raw_data[row_idx][1] if len(raw_data[row_idx]) > 1 else ""
-        csv_path = _find_csv(target_date, csv_type_name)
+        csv_path = _find_csv(target_date, csv_type_name, listing)
         if not csv_path:
             missing_csv.append(target_date)
             continue
 
+        # 読みながらフォーマットし、生のCSV行は保持しない
         with open(csv_path, encoding="utf-8") as f:
             reader = csv.reader(f)
-            next(reader)  # ヘッダースキップ
-            csv_rows = list(reader)
+            next(reader, None)  # ヘッダースキップ
+            new_rows = [_fmt_daily_row([target_date] + csv_row) for csv_row in reader]
 
-        if csv_rows:
-            all_new_rows.append((target_date, csv_rows))
+        if new_rows:
+            all_new_rows.append((target_date, new_rows))
 
     if missing_csv:
         print(f"CSVファイル未発見: {len(missing_csv)} 日分（{missing_csv[0]}〜{missing_csv[-1]}）")
@@ -417,57 +543,80 @@ def process():
         return
 
     # ─── 日別タブに一括追加 ───
-    _batch_update_daily(spreadsheet, all_new_rows)
+    daily_rows = _batch_update_daily(spreadsheet, all_new_rows, now_str)
 
-    # ─── 月別タブ再計算 ───
-    _recalc_monthly(spreadsheet)
+    # ─── 月別タブ再計算（日別タブは再取得しない）───
+    _recalc_monthly(spreadsheet, now_str, daily_rows=daily_rows)
 
     # ─── 元データの投入日時を更新 ───
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M")
     processed_dates = {d for d, _ in all_new_rows}
     updates = []
     for i, row in enumerate(raw_data):
         if len(row) >= 4 and row[0] in processed_dates:
             updates.append((i + 1, now_str))  # 1-indexed row number
 
-    # バッチ更新（投入日時列 = C列）
-    for row_num, ts in updates:
-        ws_raw.update_acell(f"C{row_num}", ts)
+    # バッチ更新（投入日時列 = C列、1回のAPI呼び出しで書き込む）
+    # batch_update の既定は RAW なので、従来の update_cell と同じく日時として解釈させる
+    if updates:
+        ws_raw.batch_update([
+            {"range": f"C{row_num}", "values": [[ts]]}
+            for row_num, ts in updates
+        ], value_input_option="USER_ENTERED")
 
     print(f"投入完了: {len(all_new_rows)} 日分")
 
 
-def _find_csv(target_date, csv_type_name=""):
-    """日付とCSVタイプ名に対応するCSVファイルを探す"""
+def _list_csv_dirs():
+    """CSV探索先ディレクトリのファイル名一覧を取得（存在しないディレクトリは空）"""
+    listing = {}
+    for dir_path in (CSV_DIR, os.path.expanduser("~/Downloads")):
+        try:
+            listing[dir_path] = set(os.listdir(dir_path))
+        except OSError:
+            listing[dir_path] = set()
+    return listing
+
+
+def _find_csv(target_date, csv_type_name="", listing=None):
+    """日付とCSVタイプ名に対応するCSVファイルを探す
+
+    listing: _list_csv_dirs() の結果。複数日を探すときは一度だけ取得して渡す。
+    """
+    if listing is None:
+        listing = _list_csv_dirs()
+    csv_dir = CSV_DIR
+    downloads = os.path.expanduser("~/Downloads")
     # 日付ベースのファイル名候補
     candidates = [
-        os.path.join(CSV_DIR, f"looker_media_funnel_{target_date}.csv"),
-        os.path.join(CSV_DIR, f"looker_{target_date}.csv"),
-        os.path.join(os.path.expanduser("~/Downloads"), f"looker_media_funnel_{target_date}.csv"),
-        os.path.join(os.path.expanduser("~/Downloads"), f"looker_{target_date}.csv"),
+        (csv_dir, f"looker_media_funnel_{target_date}.csv"),
+        (csv_dir, f"looker_{target_date}.csv"),
+        (downloads, f"looker_media_funnel_{target_date}.csv"),
+        (downloads, f"looker_{target_date}.csv"),
     ]
     # 元データのCSVダウンロードタイプ名も候補に追加
     if csv_type_name:
         base_name = csv_type_name.replace(".csv", "")
         candidates.extend([
-            os.path.join(CSV_DIR, csv_type_name),
-            os.path.join(CSV_DIR, f"{base_name}_{target_date}.csv"),
-            os.path.join(os.path.expanduser("~/Downloads"), csv_type_name),
-            os.path.join(os.path.expanduser("~/Downloads"), f"{base_name}_{target_date}.csv"),
+            (csv_dir, csv_type_name),
+            (csv_dir, f"{base_name}_{target_date}.csv"),
+            (downloads, csv_type_name),
+            (downloads, f"{base_name}_{target_date}.csv"),
         ])
-    for path in candidates:
-        if os.path.exists(path):
-            return path
+    for dir_path, name in candidates:
+        if name in listing.get(dir_path, ()):
+            return os.path.join(dir_path, name)
     return None
 
 
-def _batch_update_daily(spreadsheet, date_csv_pairs):
-    """複数日のCSVデータを日別タブに一括投入"""
+def _batch_update_daily(spreadsheet, blocks, now_str):
+    """複数日のCSVデータを日別タブに一括投入
+
+    blocks: [(日付, フォーマット済み行リスト), ...]
+    戻り値: 書き込み後の日別タブ全行
+    """
     ws_daily = spreadsheet.worksheet(DAILY_TAB)
     existing = ws_daily.get_all_values()
 
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M")
-
     # ヘッダー行を探す
     header_row_idx = None
     for i, row in enumerate(existing):
@@ -475,55 +624,33 @@ def _batch_update_daily(spreadsheet, date_csv_pairs):
             header_row_idx = i
             break
 
+    last_updated = [f"最終更新: {now_str}"] + [""] * (_DAILY_COL_COUNT - 1)
+
     if header_row_idx is None:
-        existing = [
-            ["【スキルプラス】日別データ"] + [""] * (len(DAILY_HEADER) - 1),
-            [f"最終更新: {now_str}"] + [""] * (len(DAILY_HEADER) - 1),
-            [""] * len(DAILY_HEADER),
+        # テンプレート再作成: 全データ行を日付降順に並べて全体を書き込む
+        all_data = [row for _, rows in blocks for row in rows]
+        all_data.sort(key=lambda r: r[0] if r else "", reverse=True)
+        result = [
+            ["【スキルプラス】日別データ"] + [""] * (_DAILY_COL_COUNT - 1),
+            last_updated,
+            [""] * _DAILY_COL_COUNT,
             DAILY_HEADER,
-        ]
+        ] + all_data
         header_row_idx = 3
-
-    # 新しいデータの日付セット
-    new_dates = {d for d, _ in date_csv_pairs}
-
-    # 既存データから新規日付を除外（上書き対応）
-    kept = existing[:header_row_idx + 1]
-    for row in existing[header_row_idx + 1:]:
-        if row and row[0] not in new_dates:
-            kept.append(row)
-
-    # 新しいCSV行をフォーマットして追加
-    new_formatted = []
-    for target_date, csv_rows in date_csv_pairs:
-        for csv_row in csv_rows:
-            new_formatted.append((target_date, _fmt_daily_row([target_date] + csv_row)))
-
-    # 全データ行を日付降順でソート
-    all_data = []
-    for row in kept[header_row_idx + 1:]:
-        if row and row[0]:
-            all_data.append(row)
-    for _, fmt_row in new_formatted:
-        all_data.append(fmt_row)
-
-    all_data.sort(key=lambda r: r[0] if r else "", reverse=True)
-
-    # 結果を構築
-    result = kept[:header_row_idx + 1]
-    result[1] = [f"最終更新: {now_str}"] + [""] * (len(DAILY_HEADER) - 1)
-    result.extend(all_data)
-
-    # 書き込み
-    col_count = len(DAILY_HEADER)
-    col_letter = chr(ord("A") + col_count - 1)
-    ws_daily.clear()
-    ws_daily.update(values=result, range_name=f"A1:{col_letter}{len(result)}")
-    _center_align(ws_daily, len(result), col_count)
-
-    total_new = len(new_formatted)
-    total_rows = len(all_data)
-    print(f"日別タブ更新完了: {len(date_csv_pairs)} 日分 / {total_new} 行追加（合計 {total_rows} 行）")
+        _rewrite_tab(spreadsheet, ws_daily, result, _DAILY_COL_COUNT)
+    else:
+        # 既存の同日行（上書き対象）を削除し、各日の行を日付降順の位置に挿入
+        result = _apply_date_rows(
+            spreadsheet, ws_daily, existing, header_row_idx, blocks, _DAILY_COL_COUNT,
+            extra_requests=[_write_cells_request(ws_daily, 1, [last_updated[:1]])],
+            center=True,
+        )
+        result[1] = last_updated
+
+    total_new = sum(len(rows) for _, rows in blocks)
+    total_rows = len(result) - header_row_idx - 1
+    print(f"日別タブ更新完了: {len(blocks)} 日分 / {total_new} 行追加（合計 {total_rows} 行）")
+    return result
 
 
 # ─── check_today（当日の2日前データのステータス確認）───────
@@ -11,22 +11,70 @@ handler_runner.py を通じてハンドラに委任する。
   - 新しいツール追加 = tool_registry.json に1件追加するだけ
 """
 
+import functools
+import hashlib
 import json
 import os
 import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-import anthropic
+try:
+    import orjson
+except ImportError:  # 未導入なら標準 json で動かす
+    orjson = None
 
-from clone_registry import build_agent_summary
-from handler_runner import HandlerRunner
+from clone_registry import (
+    AGENT_REGISTRY_PATH,
+    LEGACY_PROFILES_PATH,
+    PEOPLE_PUBLIC_PATH,
+    build_agent_summary,
+)
 
 # Coordinator が使う LLM モデル
 COORDINATOR_MODEL = "claude-haiku-4-5-20251001"
 COORDINATOR_MAX_TOKENS = 2000
 MAX_ROUNDS = 10  # ツール呼び出しループの上限
+TOOL_RESULT_KEEP_ROUNDS = 2  # 全文を残す直近のツール結果ラウンド数
+TOOL_RESULT_COMPACT_EVERY = 2  # 省略はこのラウンド数ぶん溜まってからまとめて行う
+OMITTED_TOOL_RESULT = "（以前の結果は省略）"
+# ツール結果の上限（UTF-8 バイト数）。日本語は1文字3バイトなので文字数より送信量を予測しやすい
+TOOL_RESULT_MAX_BYTES = 4096
+VIDEO_READER_MAX_BYTES = 8192  # video_reader は transcript を含むため緩和
+
+# 同じゴールへの応答キャッシュ（情報取得系ツールだけで完結した応答に限る）
+RESPONSE_CACHE_TTL = 300  # 秒
+RESPONSE_CACHE_MAX = 256
+
+_response_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+_GOAL_TRAILING_CHARS = "。．.、,！!？?〜~ "
+
+# 同じラウンド内で並列実行してよい情報取得系ツール（システムプロンプトのルール2と揃える）
+# tool_registry.json から構築したツール定義（mtime が変わるまで使い回す）
+_REGISTRY_CACHE = {"mtime": None, "claude_tools": None}
+_registry_cache_lock = threading.Lock()
+
+MAX_PARALLEL_TOOLS = 4
+PARALLEL_SAFE_TOOLS = frozenset({"calendar", "mail", "kpi", "people", "addness", "sheets", "search"})
+ADDNESS_READ_ACTIONS = frozenset({
+    "current_member", "search_goals", "get_goal", "list_comments",
+    "list_ai_threads", "get_ai_messages", "activity_summary",
+})
+
+# 呼んだらそのラウンドを打ち切る送信・問い合わせ系ツール（後続の tool_use は実行しない）
+TERMINAL_TOOLS = frozenset({"send_message", "ask_human"})
+SKIPPED_TOOL_RESULT = "（{name} の後に呼ばれたため実行しませんでした）"
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def _build_claude_tools(registry: dict) -> list:
@@ -39,14 +87,54 @@ def _build_claude_tools(registry: dict) -> list:
             "description": tool_def["description"],
             "input_schema": schema,
         })
+    if tools:
+        # ツール定義全体をプロンプトキャッシュの対象にする（最後のツールがブレークポイント）
+        tools[-1]["cache_control"] = {"type": "ephemeral"}
     return tools
 
 
-def _load_agent_summary(project_root: Path) -> str:
-    """agent_registry.json を優先し、必要なら legacy から導出したサマリーを返す。"""
+def _mtime_ns(path: Path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_claude_tools(registry_path: Path) -> list:
+    """tool_registry.json を読み込み、Claude API 用のツール定義を返す。
+
+    ファイルの mtime が前回と同じなら、前回構築したツール定義をそのまま再利用する。
+    読み込みに失敗した場合は FileNotFoundError / json.JSONDecodeError を送出する。
+    """
+    mtime = _mtime_ns(registry_path)
+    with _registry_cache_lock:
+        if mtime is not None and _REGISTRY_CACHE["mtime"] == mtime:
+            return _REGISTRY_CACHE["claude_tools"]
+        # orjson.JSONDecodeError は json.JSONDecodeError のサブクラス
+        registry = _json_loads(registry_path.read_bytes())
+        claude_tools = _build_claude_tools(registry)
+        _REGISTRY_CACHE["mtime"] = mtime
+        _REGISTRY_CACHE["claude_tools"] = claude_tools
+        return claude_tools
+
+
+@functools.lru_cache(maxsize=4)
+def _agent_summary_cached(mtime_key: tuple) -> str:
+    # mtime_key はキャッシュキーとしてのみ使う（元ファイルが更新されたら作り直す）
     return build_agent_summary()
 
 
+def _load_agent_summary(project_root: Path) -> str:
+    """agent_registry.json を優先し、必要なら legacy から導出したサマリーを返す。
+
+    サマリーの元になるファイルの mtime が変わらない限り、前回の結果を再利用する。
+    """
+    mtime_key = tuple(
+        _mtime_ns(path) for path in (AGENT_REGISTRY_PATH, PEOPLE_PUBLIC_PATH, LEGACY_PROFILES_PATH)
+    )
+    return _agent_summary_cached(mtime_key)
+
+
 def _load_video_knowledge(project_root: Path, goal_text: str = "") -> str:
     """ゴールテキストに関連する動画知識を検索して注入する。
     pendingエントリがあればその情報も注入する（承認フロー用）。"""
@@ -54,7 +142,7 @@ def _load_video_knowledge(project_root: Path, goal_text: str = "") -> str:
     if not knowledge_path.exists():
         return ""
     try:
-        entries = json.loads(knowledge_path.read_text(encoding="utf-8"))
+        entries = _json_loads(knowledge_path.read_bytes())
     except Exception:
         return ""
     if not entries:
@@ -172,9 +260,10 @@ def _save_video_knowledge(path: Path, data: list):
     tmp.rename(path)
 
 
-def _build_system_prompt(sender_name: str = "", project_root: Path = None, goal_text: str = "") -> str:
-    """Coordinator 用のシステムプロンプトを構築する"""
-    prompt = """あなたは甲原海人のAI秘書システムの Coordinator です。
+@functools.lru_cache(maxsize=1)
+def _base_system_prompt() -> str:
+    """送信者やゴールに依存しない Coordinator の基本ルール"""
+    return """あなたは甲原海人のAI秘書システムの Coordinator です。
 
 【最重要ルール: 認識のすり合わせ】
 ゴールを受け取ったら、まず自分の認識を提示して確認を取ること。
@@ -259,32 +348,56 @@ LoomやYouTubeのURLが送られて「見ておいて」「確認して」等の
 - 不要なツール呼び出し（聞かれていない情報まで取りに行かない）
 - 1回のゴールで10回以上のツール呼び出し"""
 
-    if sender_name:
-        prompt += f"\n\n【送信者】\n{sender_name}（秘書グループからの指示）"
 
-    # agent_registry.json からエージェント一覧を注入
+def _build_system_prompt(sender_name: str = "", project_root: Path = None, goal_text: str = "") -> list:
+    """Coordinator 用のシステムプロンプトを system ブロックのリストで構築する
+
+    ゴールをまたいで変わらない部分（ルール + エージェント一覧）を先頭ブロックにまとめて
+    プロンプトキャッシュの対象にし、送信者・動画知識などゴールごとに変わる部分は後ろの
+    ブロックに分ける。
+    """
+    prompt = _base_system_prompt()
+
+    # agent_registry.json からエージェント一覧を注入（mtime キャッシュ済みで安定）
     if project_root:
         agent_summary = _load_agent_summary(project_root)
         if agent_summary:
             prompt += f"\n\n{agent_summary}"
             prompt += "\n\n上記エージェントの得意分野を踏まえてツールを選択すること。人間に依頼する場合は ask_human ツールを使う。"
 
-        # 過去の動画知識を関連性ベースで注入
+    dynamic_parts = []
+    if sender_name:
+        dynamic_parts.append(f"【送信者】\n{sender_name}（秘書グループからの指示）")
+
+    # 過去の動画知識を関連性ベースで注入
+    if project_root:
         video_knowledge = _load_video_knowledge(project_root, goal_text)
         if video_knowledge:
-            prompt += f"\n\n{video_knowledge}"
+            dynamic_parts.append(video_knowledge)
+
+    blocks = [{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}]
+    if dynamic_parts:
+        blocks.append({"type": "text", "text": "\n\n".join(dynamic_parts)})
+    return blocks
 
-    return prompt
+
+# LINE送信前に除去するマークダウン記法（適用順に並べる）
+_MD_SUBS = [
+    ("**", re.compile(r'\*\*(.+?)\*\*'), r'\1'),          # **太字** → 太字
+    ("__", re.compile(r'__(.+?)__'), r'\1'),              # __太字__ → 太字
+    ("*", re.compile(r'(?<!\w)\*(.+?)\*(?!\w)'), r'\1'),  # *斜体* → 斜体
+    ("_", re.compile(r'(?<!\w)_(.+?)_(?!\w)'), r'\1'),    # _斜体_ → 斜体
+    ("`", re.compile(r'`(.+?)`'), r'\1'),                 # `コード` → コード
+    ("#", re.compile(r'^#{1,6}\s+', re.MULTILINE), ''),   # # 見出し → 見出し
+]
 
 
 def _strip_markdown_for_line(text: str) -> str:
     """LINE送信前にマークダウン記法を除去"""
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    text = re.sub(r'__(.+?)__', r'\1', text)
-    text = re.sub(r'(?<!\w)\*(.+?)\*(?!\w)', r'\1', text)
-    text = re.sub(r'(?<!\w)_(.+?)_(?!\w)', r'\1', text)
-    text = re.sub(r'`(.+?)`', r'\1', text)
-    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+    for marker, pattern, repl in _MD_SUBS:
+        # 記号を含まなければそのパスのスキャンごと省く
+        if marker in text:
+            text = pattern.sub(repl, text)
     return text
 
 
@@ -309,13 +422,20 @@ def execute_goal(
         (success: bool, result_text: str)
     """
     # --- 初期化 ---
+    # anthropic / HandlerRunner は重いので、実際にゴールを実行するときだけ読み込む
+    try:
+        import anthropic
+        from handler_runner import HandlerRunner
+    except ImportError as e:
+        return False, f"Coordinator の依存ライブラリを読み込めません: {e}"
+
     # APIキー: 環境変数 → config.json の順で取得
     api_key = os.environ.get("ANTHROPIC_API_KEY", "")
     if not api_key:
         config_path = Path(__file__).parent / "config.json"
         if config_path.exists():
             try:
-                cfg = json.loads(config_path.read_text(encoding="utf-8"))
+                cfg = _json_loads(config_path.read_bytes())
                 api_key = cfg.get("anthropic_api_key", "")
             except Exception:
                 pass
@@ -326,17 +446,22 @@ def execute_goal(
     except Exception as e:
         return False, f"Claude API クライアントの初期化に失敗しました: {e}"
 
-    # ツールレジストリ読み込み
+    # ツールレジストリ読み込み（mtime キャッシュ済み）
     registry_path = Path(__file__).parent / "tool_registry.json"
     try:
-        with open(registry_path, encoding="utf-8") as f:
-            registry = json.load(f)
+        claude_tools = _load_claude_tools(registry_path)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         return False, f"tool_registry.json の読み込みに失敗しました: {e}"
 
-    claude_tools = _build_claude_tools(registry)
     system_prompt = _build_system_prompt(sender_name, project_root, goal_text=goal)
 
+    # 直近に同じゴールへ答えていれば、API を呼ばずにその応答を返す
+    cache_key = _response_cache_key(goal, sender_name, system_prompt)
+    cached = _response_cache_get(cache_key)
+    if cached is not None:
+        print("   🎯 Coordinator 応答キャッシュを使用")
+        return True, cached
+
     # ハンドラランナー
     try:
         runner = HandlerRunner(
@@ -350,11 +475,14 @@ def execute_goal(
     # --- ツール呼び出しループ ---
     messages = [{"role": "user", "content": goal}]
     total_tool_calls = 0
+    cacheable = True  # 更新系・送信系ツールを使ったら応答をキャッシュしない
+    cache_read_tokens = 0
     start_time = time.time()
 
     for round_num in range(MAX_ROUNDS):
         try:
-            response = client.messages.create(
+            response = _stream_message(
+                client,
                 model=COORDINATOR_MODEL,
                 max_tokens=COORDINATOR_MAX_TOKENS,
                 system=system_prompt,
@@ -370,17 +498,20 @@ def execute_goal(
         except Exception as e:
             return False, f"Coordinator の処理中に予期しないエラーが発生しました: {type(e).__name__}: {e}"
 
+        usage = getattr(response, "usage", None)
+        cache_read_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+
         # 完了判定: end_turn → 最終回答
         if response.stop_reason == "end_turn":
-            text_parts = []
-            for block in response.content:
-                if hasattr(block, "text"):
-                    text_parts.append(block.text)
-            result = "\n".join(text_parts)
+            result = "\n".join(_response_texts(response))
             elapsed = time.time() - start_time
             print(f"   🎯 Coordinator 完了: {round_num + 1}ラウンド, "
-                  f"{total_tool_calls}ツール呼び出し, {elapsed:.1f}秒")
-            return True, _strip_markdown_for_line(result)
+                  f"{total_tool_calls}ツール呼び出し, {elapsed:.1f}秒, "
+                  f"キャッシュ読込 {cache_read_tokens}トークン")
+            result = _strip_markdown_for_line(result)
+            if cacheable:
+                _response_cache_put(cache_key, result)
+            return True, result
 
         # ツール呼び出し
         if response.stop_reason == "tool_use":
@@ -390,38 +521,20 @@ def execute_goal(
                 "content": [_serialize_content_block(b) for b in response.content],
             })
 
-            # 各ツールを実行
-            tool_results = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    total_tool_calls += 1
-                    tool_name = block.name
-                    tool_input = block.input
-
-                    print(f"   🔧 [{round_num + 1}] {tool_name}({json.dumps(tool_input, ensure_ascii=False)[:100]})")
-
-                    result_text = runner.run(tool_name, tool_input) or "（結果なし）"
-
-                    # 結果を文字数制限（トークン節約）
-                    # video_reader は transcript を含むため上限を緩和
-                    max_len = 4000 if tool_name == "video_reader" else 2000
-                    if len(result_text) > max_len:
-                        result_text = result_text[:max_len] + "\n\n（...省略）"
-
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": result_text,
-                    })
+            # 各ツールを実行（情報取得系は並列。送信・問い合わせ系より後ろは実行しない）
+            tool_results, tool_blocks = _execute_tool_round(
+                runner, [block for block in response.content if block.type == "tool_use"], round_num
+            )
+            total_tool_calls += len(tool_blocks)
+            cacheable = cacheable and _is_cacheable_round(tool_blocks)
 
             messages.append({"role": "user", "content": tool_results})
+            _compact_old_tool_results(messages)
+            _move_message_cache_breakpoint(messages)
             continue
 
         # その他の stop_reason
-        text_parts = []
-        for block in response.content:
-            if hasattr(block, "text"):
-                text_parts.append(block.text)
+        text_parts = _response_texts(response)
         if text_parts:
             return True, _strip_markdown_for_line("\n".join(text_parts))
         return True, "（処理が完了しました）"
@@ -432,15 +545,206 @@ def execute_goal(
     return True, "処理が複雑なため途中で中断しました。もう少し具体的に指示してください。"
 
 
+def _is_parallel_safe(tool_name: str, tool_input: dict) -> bool:
+    if tool_name in PARALLEL_SAFE_TOOLS:
+        return True
+    return tool_name == "addness_ops" and tool_input.get("action") in ADDNESS_READ_ACTIONS
+
+
+def _is_cacheable_round(blocks: list) -> bool:
+    """実行したツールがすべて情報取得系なら、そのラウンドは応答キャッシュの対象にできる"""
+    return all(_is_parallel_safe(block.name, block.input) for block in blocks)
+
+
+def _split_at_terminal_tool(blocks: list) -> tuple:
+    """最初の送信・問い合わせ系ツールまでを実行対象、それより後ろをスキップ対象に分ける"""
+    for i, block in enumerate(blocks):
+        if block.name in TERMINAL_TOOLS:
+            return blocks[:i + 1], blocks[i + 1:]
+    return blocks, []
+
+
+def _normalize_goal(goal: str) -> str:
+    """表記ゆれ（空白・大文字小文字・末尾の句読点）を吸収したキャッシュ用のゴール文字列"""
+    return " ".join(goal.split()).lower().rstrip(_GOAL_TRAILING_CHARS)
+
+
+def _response_cache_key(goal: str, sender_name: str, system_blocks: list) -> str:
+    # システムプロンプト（承認待ちの知識など）が変われば別キーになる
+    parts = [_normalize_goal(goal), sender_name] + [block["text"] for block in system_blocks]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _response_cache_get(key: str):
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > RESPONSE_CACHE_TTL:
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return entry[1]
+
+
+def _response_cache_put(key: str, text: str):
+    with _response_cache_lock:
+        _response_cache[key] = (time.time(), text)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_MAX:
+            _response_cache.popitem(last=False)
+
+
+def _result_max_bytes(tool_name: str) -> int:
+    return VIDEO_READER_MAX_BYTES if tool_name == "video_reader" else TOOL_RESULT_MAX_BYTES
+
+
+def _run_tool(runner, block) -> str:
+    try:
+        # 1文字は1バイト以上なので、バイト上限と同じ文字数で先に切っておけば後段の判定と矛盾しない
+        output = runner.run(block.name, block.input, max_output_chars=_result_max_bytes(block.name))
+        return output or "（結果なし）"
+    except Exception as e:
+        return f"ツール '{block.name}' の実行中にエラーが発生しました: {type(e).__name__}: {e}"
+
+
+def _run_tool_batch(runner, blocks: list) -> list:
+    """1ラウンド分の tool_use を実行し、blocks と同じ順で結果テキストを返す。
+
+    連続する情報取得系ツールはスレッドで並列に実行する。更新系・送信系はその都度
+    単独で順番に実行し、前後の呼び出しとの順序を保つ。
+    """
+    results = []
+    group = []
+
+    def flush_group():
+        if len(group) == 1:
+            results.append(_run_tool(runner, group[0]))
+        elif group:
+            with ThreadPoolExecutor(max_workers=min(len(group), MAX_PARALLEL_TOOLS)) as pool:
+                results.extend(pool.map(lambda b: _run_tool(runner, b), group))
+        group.clear()
+
+    for block in blocks:
+        if _is_parallel_safe(block.name, block.input):
+            group.append(block)
+            continue
+        flush_group()
+        results.append(_run_tool(runner, block))
+    flush_group()
+    return results
+
+
+def _execute_tool_round(runner, blocks: list, round_num: int = 0) -> tuple:
+    """1ラウンド分の tool_use を実行し、(tool_results, 実行した blocks) を返す。
+
+    最初の送信・問い合わせ系ツールより後ろは実行せず、API 上の対応関係を保つため
+    スキップした旨の tool_result を返す。
+    """
+    tool_blocks, skipped_blocks = _split_at_terminal_tool(blocks)
+    for block in tool_blocks:
+        print(f"   🔧 [{round_num + 1}] {block.name}({json.dumps(block.input, ensure_ascii=False)[:100]})")
+
+    tool_results = []
+    for block, result_text in zip(tool_blocks, _run_tool_batch(runner, tool_blocks)):
+        # 結果をバイト数で制限（トークン節約）
+        tool_results.append({
+            "type": "tool_result",
+            "tool_use_id": block.id,
+            "content": _truncate_utf8(result_text, _result_max_bytes(block.name)),
+        })
+    for block in skipped_blocks:
+        print(f"   ⏭️ [{round_num + 1}] {block.name} をスキップ（{tool_blocks[-1].name} の後）")
+        tool_results.append({
+            "type": "tool_result",
+            "tool_use_id": block.id,
+            "content": SKIPPED_TOOL_RESULT.format(name=tool_blocks[-1].name),
+        })
+    return tool_results, tool_blocks
+
+
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    """UTF-8 で max_bytes を超える部分を切り捨てる（文字の途中では切らない）"""
+    if len(text) * 4 <= max_bytes:  # 1文字は最大4バイトなので確実に収まる
+        return text
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", errors="ignore") + "\n\n（...省略）"
+
+
+def _stream_message(client, **params):
+    """messages.stream で応答を受け取り、最終メッセージを返す。
+
+    長い生成でも HTTP 読み取りタイムアウトにかからないよう、ストリーミングで受信する。
+    """
+    with client.messages.stream(**params) as stream:
+        return stream.get_final_message()
+
+
+def _compact_old_tool_results(
+    messages: list,
+    keep_rounds: int = TOOL_RESULT_KEEP_ROUNDS,
+    every: int = TOOL_RESULT_COMPACT_EVERY,
+) -> None:
+    """直近 keep_rounds ラウンドより古い tool_result の本文を省略表記に置き換える。
+
+    tool_use_id は残すので API 上の対応関係は崩れない。毎ラウンド再送する入力を抑える。
+    毎ラウンド1つずつ省略するとキャッシュ済みの履歴が毎回書き換わるため、全文のラウンドが
+    keep_rounds + every に達したときだけまとめて省略し、それ以外のラウンドは履歴を変えない。
+    """
+    full_turns = [
+        msg for msg in messages
+        if msg["role"] == "user" and isinstance(msg["content"], list)
+        and any(
+            part.get("type") == "tool_result" and part.get("content") != OMITTED_TOOL_RESULT
+            for part in msg["content"]
+        )
+    ]
+    if len(full_turns) < keep_rounds + every:
+        return
+    for msg in full_turns[:-keep_rounds] if keep_rounds else full_turns:
+        for part in msg["content"]:
+            if part.get("type") == "tool_result":
+                part["content"] = OMITTED_TOOL_RESULT
+
+
+def _move_message_cache_breakpoint(messages: list) -> None:
+    """会話履歴のキャッシュブレークポイントを最新メッセージの末尾ブロックへ移す。
+
+    system・tools と合わせてブレークポイントは3つ（上限4）に保つ。次のラウンドは
+    ここまでの履歴をキャッシュ読込で済ませ、新しく増えた分だけが通常課金になる。
+    """
+    for msg in messages[:-1]:
+        if isinstance(msg["content"], list):
+            for part in msg["content"]:
+                part.pop("cache_control", None)
+    last = messages[-1]["content"]
+    if isinstance(last, list) and last:
+        last[-1]["cache_control"] = {"type": "ephemeral"}
+
+
+def _response_texts(response) -> list:
+    """応答の text ブロックの本文を順に返す"""
+    return [block.text for block in response.content if block.type == "text"]
+
+
+# block.type → dict 変換（未知の type は文字列化して text として扱う）
+_BLOCK_SERIALIZERS = {
+    "text": lambda block: {"type": "text", "text": block.text},
+    "tool_use": lambda block: {
+        "type": "tool_use",
+        "id": block.id,
+        "name": block.name,
+        "input": block.input,
+    },
+}
+
+
+def _serialize_unknown_block(block) -> dict:
+    return {"type": "text", "text": str(block)}
+
+
 def _serialize_content_block(block) -> dict:
     """Anthropic SDK のコンテンツブロックを dict に変換する"""
-    if block.type == "text":
-        return {"type": "text", "text": block.text}
-    elif block.type == "tool_use":
-        return {
-            "type": "tool_use",
-            "id": block.id,
-            "name": block.name,
-            "input": block.input,
-        }
-    return {"type": "text", "text": str(block)}
+    return _BLOCK_SERIALIZERS.get(block.type, _serialize_unknown_block)(block)
@@ -7,18 +7,37 @@
 使い方:
   python3 generate_comm_profiles.py           # 全員をルールベースで生成
   python3 generate_comm_profiles.py --claude  # Claude APIで詳細生成（要APIキー）
+  python3 generate_comm_profiles.py --batch   # Message Batches API でまとめて生成（半額・完了まで数分〜）
   python3 generate_comm_profiles.py --show 山田太郎  # 特定の人のプロファイルを表示
 """
 
+import hashlib
 import json
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # 未導入なら標準 json で動かす
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # 未導入なら --show でもファイル全体を読み込む
+    ijson = None
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 PROFILES_JSON = PROJECT_ROOT / "Master" / "people" / "profiles.json"
 
+CLAUDE_MODEL = "claude-haiku-4-5-20251001"
+CLAUDE_MAX_TOKENS = 400
+CLAUDE_MAX_WORKERS = 8  # --claude 時の同時リクエスト数
+BATCH_POLL_INTERVAL = 30  # 秒
+
 # カテゴリ別の返信スタイル定義
 STYLE_BY_CATEGORY = {
     "上司": {
@@ -67,10 +86,45 @@ DEFAULT_STYLE = {
 }
 
 
-def generate_comm_profile_rule_based(profile: dict) -> dict:
-    """ルールベースでcomm_profileを生成"""
+def _style_tuple(style_def: dict) -> tuple:
+    return (
+        style_def["formality"],
+        style_def["greeting"],
+        style_def["style"],
+        tuple(style_def["tone_keywords"]),
+        tuple(style_def.get("avoid", [])),
+    )
+
+
+# カテゴリ → (formality, greeting, style, tone_keywords, avoid) をロード時に展開しておく
+_STYLE_TUPLES = {category: _style_tuple(s) for category, s in STYLE_BY_CATEGORY.items()}
+_DEFAULT_STYLE_TUPLE = _style_tuple(DEFAULT_STYLE)
+
+
+# ルールベース生成の入力になるフィールド（これらが変わらなければ結果も変わらない）
+_FINGERPRINT_FIELDS = ("category", "active_goals", "inferred_domains", "identity_notes", "notes")
+
+
+def _profile_fingerprint(profile: dict) -> str:
+    """ルールベース生成の入力（プロファイル側 + カテゴリのスタイル定義）のハッシュ"""
     category = profile.get("category", "")
-    style_def = STYLE_BY_CATEGORY.get(category, DEFAULT_STYLE)
+    source = [profile.get(k) for k in _FINGERPRINT_FIELDS]
+    source.append(_STYLE_TUPLES.get(category, _DEFAULT_STYLE_TUPLE))
+    if orjson is not None:
+        payload = orjson.dumps(source, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(source, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def generate_comm_profile_rule_based(profile: dict, generated_at: str = None) -> dict:
+    """ルールベースでcomm_profileを生成
+
+    generated_at を渡すとその時刻を使う（一括生成では main で1回だけ取る）。
+    """
+    formality, greeting, style_note, tone_keywords, avoid = _STYLE_TUPLES.get(
+        profile.get("category", ""), _DEFAULT_STYLE_TUPLE
+    )
 
     # 現在のフォーカストピック（active_goals から抽出）
     active_goals = profile.get("active_goals", [])
@@ -87,83 +141,183 @@ def generate_comm_profile_rule_based(profile: dict) -> dict:
         extra_notes.append(profile["notes"][:100])
 
     return {
-        "formality": style_def["formality"],
-        "greeting": style_def["greeting"],
-        "style_note": style_def["style"],
-        "tone_keywords": style_def["tone_keywords"],
-        "avoid": style_def.get("avoid", []),
+        "formality": formality,
+        "greeting": greeting,
+        "style_note": style_note,
+        "tone_keywords": tone_keywords,
+        "avoid": avoid,
         "current_focus": current_focus,
         "domains": domains[:5],
         "extra_notes": extra_notes,
         "context_notes": [],  # LINEメモコマンドで追加される欄
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": generated_at or datetime.now().isoformat(),
         "auto_generated": True,
+        "_fingerprint": _profile_fingerprint(profile),
     }
 
 
-def generate_comm_profile_claude(profile: dict, api_key: str) -> dict:
-    """Claude APIを使って詳細なcomm_profileを生成"""
-    try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=api_key)
+# 全員共通の指示と出力フォーマット
+CLAUDE_SYSTEM_PROMPT = """メンバープロファイルをもとに、甲原海人（Addness代表）がLINEでこの人に返信する際の最適なコミュニケーションスタイルを生成してください。
+
+【出力フォーマット（JSON）】
+{
+  "style_note": "この人への最適な返信スタイルを2-3文で",
+  "tone_keywords": ["キーワード1", "キーワード2", "キーワード3"],
+  "best_opener": "最適な書き出しの例",
+  "current_focus_context": "今この人が注力していることを踏まえた関係の文脈（1文）",
+  "avoid": ["避けるべき表現・スタイル"]
+}
+
+JSONのみを出力してください。"""
 
-        name = profile.get("name", "不明")
-        category = profile.get("category", "")
-        capability = profile.get("capability_summary", "")[:300]
-        goals_text = "\n".join([f"- {g['title']}" for g in profile.get("active_goals", [])[:5]])
-        domains = ", ".join(profile.get("inferred_domains", [])[:5])
 
-        prompt = f"""以下のメンバープロファイルをもとに、甲原海人（Addness代表）がLINEでこの人に返信する際の最適なコミュニケーションスタイルを生成してください。
+def _build_claude_prompt(profile: dict) -> str:
+    """comm_profile 生成用のメンバーごとの入力（共通の指示は CLAUDE_SYSTEM_PROMPT 側）"""
+    name = profile.get("name", "不明")
+    category = profile.get("category", "")
+    capability = profile.get("capability_summary", "")[:300]
+    goals_text = "\n".join([f"- {g['title']}" for g in profile.get("active_goals", [])[:5]])
+    domains = ", ".join(profile.get("inferred_domains", [])[:5])
 
-【メンバー情報】
+    return f"""【メンバー情報】
 名前: {name}
 関係: {category}
 スキル・専門: {domains}
 能力サマリー: {capability}
 現在の取り組み:
-{goals_text or '（情報なし）'}
+{goals_text or '（情報なし）'}"""
 
-【出力フォーマット（JSON）】
-{{
-  "style_note": "この人への最適な返信スタイルを2-3文で",
-  "tone_keywords": ["キーワード1", "キーワード2", "キーワード3"],
-  "best_opener": "最適な書き出しの例",
-  "current_focus_context": "今この人が注力していることを踏まえた関係の文脈（1文）",
-  "avoid": ["避けるべき表現・スタイル"]
-}}
 
-JSONのみを出力してください。"""
+def _merge_claude_response(profile: dict, text: str) -> dict:
+    """Claude の応答テキストから JSON を取り出し、ルールベースの結果と統合する"""
+    text = text.strip()
+    # JSON部分を抽出
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+
+    claude_data = json.loads(text)
+
+    # ルールベースのデータと統合
+    base = generate_comm_profile_rule_based(profile)
+    base.update(claude_data)
+    base["auto_generated"] = False  # Claude生成
+    base["generated_at"] = datetime.now().isoformat()
+    return base
 
-        response = client.messages.create(
-            model="claude-haiku-4-5-20251001",
-            max_tokens=400,
-            messages=[{"role": "user", "content": prompt}]
-        )
 
-        text = response.content[0].text.strip()
-        # JSON部分を抽出
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0].strip()
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0].strip()
+def generate_comm_profile_claude(profile: dict, api_key: str, client=None) -> dict:
+    """Claude APIを使って詳細なcomm_profileを生成
 
-        claude_data = json.loads(text)
+    client を渡した場合はそれを使う（並列実行時にクライアントを共有するため）。
+    """
+    try:
+        if client is None:
+            import anthropic
+            client = anthropic.Anthropic(api_key=api_key)
 
-        # ルールベースのデータと統合
-        base = generate_comm_profile_rule_based(profile)
-        base.update(claude_data)
-        base["auto_generated"] = False  # Claude生成
-        base["generated_at"] = datetime.now().isoformat()
-        return base
+        response = client.messages.create(
+            model=CLAUDE_MODEL,
+            max_tokens=CLAUDE_MAX_TOKENS,
+            system=CLAUDE_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": _build_claude_prompt(profile)}]
+        )
+        return _merge_claude_response(profile, response.content[0].text)
 
     except Exception as e:
         print(f"    Claude APIエラー: {e} → ルールベースにフォールバック")
         return generate_comm_profile_rule_based(profile)
 
 
-def show_profile(name_query: str, data: dict):
-    """特定人物のプロファイルを表示"""
-    for key, value in data.items():
+def generate_comm_profiles_parallel(targets: list, api_key: str) -> dict:
+    """targets [(key, profile), ...] をスレッドプールで並列生成し {key: comm_profile} を返す"""
+    import anthropic
+    client = anthropic.Anthropic(api_key=api_key)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=CLAUDE_MAX_WORKERS) as pool:
+        futures = {
+            pool.submit(generate_comm_profile_claude, profile, api_key, client): (key, profile)
+            for key, profile in targets
+        }
+        for future in as_completed(futures):
+            key, profile = futures[future]
+            results[key] = future.result()
+            print(f"  🔄 {profile.get('name', key)} → 生成完了")
+    return results
+
+
+def generate_comm_profiles_batch(targets: list, api_key: str) -> dict:
+    """targets [(key, profile), ...] を Message Batches API でまとめて生成する。
+
+    完了までポーリングし、成功した分だけ {key: comm_profile} で返す。
+    失敗・未完了の分は呼び出し側で個別生成にフォールバックする。
+    """
+    import anthropic
+    client = anthropic.Anthropic(api_key=api_key)
+
+    # custom_id は英数字のみ許可されるため、名前ではなく連番を使う
+    by_id = {f"p{i}": (key, profile) for i, (key, profile) in enumerate(targets)}
+    batch = client.messages.batches.create(requests=[
+        {
+            "custom_id": custom_id,
+            "params": {
+                "model": CLAUDE_MODEL,
+                "max_tokens": CLAUDE_MAX_TOKENS,
+                "system": CLAUDE_SYSTEM_PROMPT,
+                "messages": [{"role": "user", "content": _build_claude_prompt(profile)}],
+            },
+        }
+        for custom_id, (key, profile) in by_id.items()
+    ])
+    print(f"  📦 バッチ送信: {batch.id}（{len(by_id)}件）")
+
+    while batch.processing_status != "ended":
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.messages.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        print(f"  ⏳ 処理中: 完了 {counts.succeeded + counts.errored}/{len(by_id)}")
+
+    results = {}
+    for entry in client.messages.batches.results(batch.id):
+        if entry.custom_id not in by_id or entry.result.type != "succeeded":
+            continue
+        key, profile = by_id[entry.custom_id]
+        try:
+            results[key] = _merge_claude_response(profile, entry.result.message.content[0].text)
+        except Exception as e:
+            print(f"    {profile.get('name', key)}: 応答の解析に失敗: {e}")
+    return results
+
+
+def _load_profiles() -> dict:
+    data = PROFILES_JSON.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_profiles(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _save_profiles(data: dict):
+    """profiles.json をアトミックに書き込む（途中で落ちても元ファイルは壊れない）"""
+    tmp = PROFILES_JSON.with_name(PROFILES_JSON.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_dump_profiles(data))
+    os.replace(tmp, PROFILES_JSON)
+
+
+def show_profile(name_query: str, items):
+    """特定人物のプロファイルを表示
+
+    items は (key, value) のイテラブル。見つかった時点で読むのをやめる。
+    """
+    for key, value in items:
         profile = value.get("latest", value)
         name = profile.get("name", key)
         if name_query.lower() in name.lower() or name_query.lower() in key.lower():
@@ -174,7 +328,8 @@ def show_profile(name_query: str, data: dict):
 
 
 def main():
-    use_claude = "--claude" in sys.argv
+    use_batch = "--batch" in sys.argv
+    use_claude = use_batch or "--claude" in sys.argv
     show_query = None
 
     if "--show" in sys.argv:
@@ -186,13 +341,17 @@ def main():
         print(f"❌ {PROFILES_JSON} が見つかりません")
         sys.exit(1)
 
-    with open(PROFILES_JSON, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     if show_query:
-        show_profile(show_query, data)
+        if ijson is not None:
+            # トップレベルを1人ずつ読み、該当者が見つかったらそこで止める
+            with open(PROFILES_JSON, "rb") as f:
+                show_profile(show_query, ijson.kvitems(f, "", use_float=True))
+        else:
+            show_profile(show_query, _load_profiles().items())
         return
 
+    data = _load_profiles()
+
     api_key = ""
     if use_claude:
         api_key = os.environ.get("ANTHROPIC_API_KEY", "")
@@ -213,6 +372,8 @@ def main():
     updated = 0
     skipped = 0
 
+    # 1. 生成対象を集める
+    targets = []
     for key, value in data.items():
         # latest フィールドを取得
         if "latest" in value:
@@ -235,25 +396,55 @@ def main():
             skipped += 1
             continue
 
-        print(f"  🔄 {name} ({profile.get('category', '?')})", end="")
+        # ルールベースで、前回生成時から入力が変わっていなければ作り直さない
+        if (
+            not use_claude
+            and existing.get("auto_generated")
+            and "--force" not in sys.argv
+            and existing.get("_fingerprint") == _profile_fingerprint(profile)
+        ):
+            skipped += 1
+            continue
 
+        targets.append((key, profile))
+
+    # 2. 生成する（Claude はバッチ or 並列、失敗分は個別生成にフォールバック）
+    comm_profiles = {}
+    if use_batch and targets:
+        try:
+            comm_profiles = generate_comm_profiles_batch(targets, api_key)
+        except Exception as e:
+            print(f"  Batch APIエラー: {e} → 個別生成にフォールバック")
+        remaining = [(key, profile) for key, profile in targets if key not in comm_profiles]
+        if remaining:
+            comm_profiles.update(generate_comm_profiles_parallel(remaining, api_key))
+    elif use_claude and targets:
+        comm_profiles = generate_comm_profiles_parallel(targets, api_key)
+
+    # 3. 反映する
+    generated_at = datetime.now().isoformat()
+    for key, profile in targets:
         if use_claude:
-            comm_profile = generate_comm_profile_claude(profile, api_key)
+            comm_profile = comm_profiles[key]
         else:
-            comm_profile = generate_comm_profile_rule_based(profile)
+            comm_profile = generate_comm_profile_rule_based(profile, generated_at)
+            print(f"  🔄 {profile.get('name', key)} ({profile.get('category', '?')}) → 生成完了")
 
         profile["comm_profile"] = comm_profile
+        value = data[key]
         if "latest" in value:
             value["latest"] = profile
         else:
             data[key] = profile
 
         updated += 1
-        print(f" → 生成完了")
 
-    # 保存
-    with open(PROFILES_JSON, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # 1件も生成していなければ書き戻さない
+    if not updated:
+        print(f"\n✅ 変更なし: {skipped}名をスキップ")
+        return
+
+    _save_profiles(data)
 
     print(f"\n✅ 完了: {updated}名を生成、{skipped}名をスキップ")
     print(f"   保存先: {PROFILES_JSON}")
@@ -18,6 +18,7 @@ import json
 import os
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
@@ -686,8 +687,12 @@ class HandlerRunner:
             lines.append(f"補足: {policy['rule_note']}")
         return "\n".join(lines)
 
-    def run(self, tool_name: str, arguments: dict) -> str:
-        """ツールを実行して結果テキストを返す"""
+    def run(self, tool_name: str, arguments: dict, max_output_chars: int = None) -> str:
+        """ツールを実行して結果テキストを返す
+
+        max_output_chars を指定すると結果をその文字数までに切り詰める。subprocess と
+        file_read は上限までしか読み込まないので、巨大な出力でもメモリに載せない。
+        """
         tool_def = self._tool_map.get(tool_name)
         if not tool_def:
             return f"ツール '{tool_name}' は登録されていません"
@@ -696,21 +701,21 @@ class HandlerRunner:
 
         try:
             if handler_type == "subprocess":
-                return self._run_subprocess(tool_def, arguments)
+                output = self._run_subprocess(tool_def, arguments, max_output_chars)
             elif handler_type == "function":
-                return self._run_function(tool_def, arguments)
+                output = self._run_function(tool_def, arguments)
             elif handler_type == "file_read":
-                return self._run_file_read(tool_def, arguments)
+                output = self._run_file_read(tool_def, arguments, max_output_chars)
             elif handler_type == "action":
-                return self._run_action(tool_def, arguments)
+                output = self._run_action(tool_def, arguments)
             elif handler_type == "claude_search":
-                return self._run_claude_search(arguments)
+                output = self._run_claude_search(arguments)
             elif handler_type == "api_call":
-                return self._run_api_call(tool_def, arguments)
+                output = self._run_api_call(tool_def, arguments)
             elif handler_type == "workflow_endpoint":
-                return self._run_workflow(tool_def, arguments)
+                output = self._run_workflow(tool_def, arguments)
             elif handler_type == "mcp":
-                return self._run_mcp(tool_def, arguments)
+                output = self._run_mcp(tool_def, arguments)
             else:
                 return f"未対応の handler_type です: {handler_type}"
         except requests.Timeout:
@@ -726,10 +731,14 @@ class HandlerRunner:
             err_type = type(e).__name__
             return f"ツール '{tool_name}' の実行中にエラーが発生しました: {err_type}: {e}"
 
+        if max_output_chars is not None and output and len(output) > max_output_chars:
+            output = output[:max_output_chars] + "\n\n（...省略）"
+        return output
+
     # ------------------------------------------------------------------
     # subprocess: 外部Pythonスクリプト実行
     # ------------------------------------------------------------------
-    def _run_subprocess(self, tool_def: dict, arguments: dict) -> str:
+    def _run_subprocess(self, tool_def: dict, arguments: dict, max_output_chars: int = None) -> str:
         handler_path = tool_def.get("handler_path", "")
         script = self.system_dir / handler_path
         if not script.exists():
@@ -1085,16 +1094,19 @@ class HandlerRunner:
         # video_reader と Addness 操作は時間がかかることがある
         timeout = 600 if tool_name == "video_reader" else 300 if tool_name == "addness_ops" else 120
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=str(self.system_dir),
-            env=self._subprocess_env,
-        )
-
-        output = result.stdout.strip()
+        # stdout は一時ファイルに受け、上限 +1 文字までだけ読み戻す（巨大出力をメモリに載せない）
+        with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as stdout_file:
+            result = subprocess.run(
+                cmd,
+                stdout=stdout_file,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=timeout,
+                cwd=str(self.system_dir),
+                env=self._subprocess_env,
+            )
+            stdout_file.seek(0)
+            output = stdout_file.read(-1 if max_output_chars is None else max_output_chars + 1).strip()
         if result.returncode != 0:
             error = result.stderr.strip()
             if output:
@@ -1127,7 +1139,7 @@ class HandlerRunner:
     # ------------------------------------------------------------------
     # file_read: ファイル読み込み
     # ------------------------------------------------------------------
-    def _run_file_read(self, tool_def: dict, arguments: dict) -> str:
+    def _run_file_read(self, tool_def: dict, arguments: dict, max_output_chars: int = None) -> str:
         handler_path = tool_def.get("handler_path", "")
 
         # Master/ 配下を探す
@@ -1138,11 +1150,13 @@ class HandlerRunner:
         if not file_path.exists():
             return f"ファイルが見つかりません: {handler_path}"
 
+        # 先頭 4000 文字に制限（トークン節約）。上限までしか読み込まない
+        limit = 4000 if max_output_chars is None else min(4000, max_output_chars)
         try:
-            content = file_path.read_text(encoding="utf-8")
-            # 先頭 4000 文字に制限（トークン節約）
-            if len(content) > 4000:
-                content = content[:4000] + "\n\n（...以下省略。全 {} 文字）".format(len(content))
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read(limit + 1)
+            if len(content) > limit:
+                content = content[:limit] + "\n\n（...以下省略。全 {} バイト）".format(file_path.stat().st_size)
             return content
         except Exception as e:
             return f"ファイル読み込みエラー: {e}"
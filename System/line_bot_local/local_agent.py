@@ -21,6 +21,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 import clone_registry
+from coordinator import _strip_markdown_for_line
 
 # Coordinator（ゴール実行エンジン）
 _COORDINATOR_AVAILABLE = False
@@ -2881,17 +2882,6 @@ def _build_coordinator_handlers() -> dict:
     }
 
 
-def _strip_markdown_for_line(text: str) -> str:
-    """LINE送信前にマークダウン記法を除去（安全弁）"""
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)   # **太字** → 太字
-    text = re.sub(r'__(.+?)__', r'\1', text)        # __太字__ → 太字
-    text = re.sub(r'(?<!\w)\*(.+?)\*(?!\w)', r'\1', text)  # *斜体* → 斜体
-    text = re.sub(r'(?<!\w)_(.+?)_(?!\w)', r'\1', text)    # _斜体_ → 斜体
-    text = re.sub(r'`(.+?)`', r'\1', text)           # `コード` → コード
-    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)  # # 見出し → 見出し
-    return text
-
-
 def _format_message_preview(text: str, limit: int = 280) -> str:
     cleaned = str(text or "").replace("\r\n", "\n").replace("\r", "\n").strip()
     cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
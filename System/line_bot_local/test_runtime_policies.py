@@ -2,8 +2,11 @@ import importlib.util
 import json
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
 
 
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
@@ -12,6 +15,7 @@ LINE_BOT_LOCAL_DIR = SYSTEM_DIR / "line_bot_local"
 LINE_BOT_APP_PATH = SYSTEM_DIR / "line_bot" / "app.py"
 HANDLER_RUNNER_PATH = LINE_BOT_LOCAL_DIR / "handler_runner.py"
 LOCAL_AGENT_PATH = LINE_BOT_LOCAL_DIR / "local_agent.py"
+COORDINATOR_PATH = LINE_BOT_LOCAL_DIR / "coordinator.py"
 
 for path in (SYSTEM_DIR, LINE_BOT_LOCAL_DIR):
     path_str = str(path)
@@ -27,6 +31,29 @@ def load_module(module_name: str, file_path: Path):
     return module
 
 
+def tool_block(block_id: str, name: str, tool_input: dict = None):
+    return SimpleNamespace(id=block_id, name=name, input=tool_input or {})
+
+
+class RecordingRunner:
+    """HandlerRunner の代わりに、ツールの開始・終了順を記録する"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.events = []
+        self._lock = threading.Lock()
+
+    def run(self, name, tool_input, max_output_chars=None):
+        with self._lock:
+            self.events.append(("start", name))
+        time.sleep(0.05)
+        with self._lock:
+            self.events.append(("end", name))
+        if name in self.fail:
+            raise RuntimeError(f"{name} failed")
+        return f"{name} ok"
+
+
 class RuntimePolicyTest(unittest.TestCase):
     def test_extra_disclosure_requires_exception(self):
         handler_runner = load_module("handler_runner_test_case_1", HANDLER_RUNNER_PATH)
@@ -285,6 +312,110 @@ class RuntimePolicyTest(unittest.TestCase):
         self.assertEqual(payload["delivery_targets"]["chatwork"]["room_id"], "R321")
         self.assertIn("三上功太", app_module.contact_routes)
 
+    def test_tool_round_keeps_write_calls_ordered_between_parallel_reads(self):
+        coordinator = load_module("coordinator_test_case_ordering", COORDINATOR_PATH)
+        runner = RecordingRunner()
+        blocks = [
+            tool_block("t1", "kpi"),
+            tool_block("t2", "calendar"),
+            tool_block("t3", "addness_ops", {"action": "create_goal"}),
+            tool_block("t4", "mail"),
+        ]
+
+        tool_results, executed = coordinator._execute_tool_round(runner, blocks)
+
+        self.assertEqual(executed, blocks)
+        self.assertEqual([r["tool_use_id"] for r in tool_results], ["t1", "t2", "t3", "t4"])
+        self.assertEqual(
+            [r["content"] for r in tool_results],
+            ["kpi ok", "calendar ok", "addness_ops ok", "mail ok"],
+        )
+        # 更新系は前の情報取得がすべて終わってから始まり、次の呼び出しより先に終わる
+        write_start = runner.events.index(("start", "addness_ops"))
+        write_end = runner.events.index(("end", "addness_ops"))
+        self.assertLess(runner.events.index(("end", "kpi")), write_start)
+        self.assertLess(runner.events.index(("end", "calendar")), write_start)
+        self.assertLess(write_end, runner.events.index(("start", "mail")))
+
+    def test_tool_round_skips_blocks_after_send_message(self):
+        coordinator = load_module("coordinator_test_case_terminal", COORDINATOR_PATH)
+        runner = RecordingRunner()
+        blocks = [
+            tool_block("t1", "kpi"),
+            tool_block("t2", "send_message", {"recipient": "直下先"}),
+            tool_block("t3", "calendar"),
+            tool_block("t4", "addness_ops", {"action": "create_goal"}),
+        ]
+
+        tool_results, executed = coordinator._execute_tool_round(runner, blocks)
+
+        self.assertEqual([b.id for b in executed], ["t1", "t2"])
+        self.assertEqual([r["tool_use_id"] for r in tool_results], ["t1", "t2", "t3", "t4"])
+        placeholder = coordinator.SKIPPED_TOOL_RESULT.format(name="send_message")
+        self.assertEqual(tool_results[2]["content"], placeholder)
+        self.assertEqual(tool_results[3]["content"], placeholder)
+        ran = {name for _, name in runner.events}
+        self.assertEqual(ran, {"kpi", "send_message"})
+
+    def test_tool_round_turns_handler_exception_into_error_result(self):
+        coordinator = load_module("coordinator_test_case_exception", COORDINATOR_PATH)
+        runner = RecordingRunner(fail={"calendar"})
+        blocks = [tool_block("t1", "kpi"), tool_block("t2", "calendar"), tool_block("t3", "mail")]
+
+        tool_results, _ = coordinator._execute_tool_round(runner, blocks)
+
+        self.assertEqual([r["tool_use_id"] for r in tool_results], ["t1", "t2", "t3"])
+        self.assertIn("calendar", tool_results[1]["content"])
+        self.assertIn("RuntimeError: calendar failed", tool_results[1]["content"])
+        self.assertEqual(tool_results[0]["content"], "kpi ok")
+        self.assertEqual(tool_results[2]["content"], "mail ok")
+
+    def test_response_is_cacheable_only_when_every_executed_tool_is_read_only(self):
+        coordinator = load_module("coordinator_test_case_cacheable", COORDINATOR_PATH)
+
+        self.assertTrue(coordinator._is_cacheable_round([]))
+        self.assertTrue(coordinator._is_cacheable_round(
+            [tool_block("t1", "kpi"), tool_block("t2", "calendar"), tool_block("t3", "search")]
+        ))
+        self.assertTrue(coordinator._is_cacheable_round(
+            [tool_block("t1", "addness_ops", {"action": "search_goals"})]
+        ))
+        self.assertFalse(coordinator._is_cacheable_round(
+            [tool_block("t1", "kpi"), tool_block("t2", "send_message", {"recipient": "直下先"})]
+        ))
+        self.assertFalse(coordinator._is_cacheable_round(
+            [tool_block("t1", "kpi"), tool_block("t2", "addness_ops", {"action": "create_goal"})]
+        ))
+
+        # スキップされた送信系は実行していないので、キャッシュ可否に影響しない
+        _, executed = coordinator._execute_tool_round(
+            RecordingRunner(),
+            [tool_block("t1", "kpi"), tool_block("t2", "ask_human"), tool_block("t3", "send_message")],
+        )
+        self.assertFalse(coordinator._is_cacheable_round(executed))
+        _, executed = coordinator._execute_tool_round(
+            RecordingRunner(), [tool_block("t1", "kpi"), tool_block("t2", "mail")]
+        )
+        self.assertTrue(coordinator._is_cacheable_round(executed))
+
+    def test_response_cache_key_changes_with_system_text(self):
+        coordinator = load_module("coordinator_test_case_cache_key", COORDINATOR_PATH)
+        system_blocks = [{"type": "text", "text": "基本プロンプト"}, {"type": "text", "text": "承認待ち: なし"}]
+        key = coordinator._response_cache_key("今日の予定は？", "甲", system_blocks)
+
+        self.assertEqual(key, coordinator._response_cache_key(" 今日の予定は ", "甲", system_blocks))
+        self.assertNotEqual(key, coordinator._response_cache_key(
+            "今日の予定は？", "甲", [system_blocks[0], {"type": "text", "text": "承認待ち: 1件"}]
+        ))
+        self.assertNotEqual(key, coordinator._response_cache_key("今日の予定は？", "乙", system_blocks))
+
+        coordinator._response_cache_put(key, "10時から定例です")
+        self.assertEqual(coordinator._response_cache_get(key), "10時から定例です")
+        other_key = coordinator._response_cache_key(
+            "今日の予定は？", "甲", [system_blocks[0], {"type": "text", "text": "承認待ち: 1件"}]
+        )
+        self.assertIsNone(coordinator._response_cache_get(other_key))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -468,6 +468,21 @@ def _build_execution_rules_compact() -> str:
     return _execution_rules_compact_cache
 
 
+# 甲原の Slack メッセージ → 日向コマンド種別（上から順に判定）。1本の正規表現で1回だけ走査する
+_SLACK_COMMAND_PATTERNS = [
+    ("stop", ["止まって", "ストップ", "止めて", "待って", "やめて"]),
+    ("status", ["状況は", "どうなってる", "今何してる", "ステータス"]),
+    ("resume", ["再開", "動いて", "始めて", "起きて"]),
+    ("mode_change", ["レベルアップ", "レベル2", "レベル3", "lv.2", "lv.3", "lv2", "lv3",
+                     "mode report", "mode propose", "mode execute",
+                     "モード変更", "レベル変更"]),
+]
+_SLACK_COMMAND_RES = [
+    (command, re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE))
+    for command, keywords in _SLACK_COMMAND_PATTERNS
+]
+
+
 def set_repair_agent(agent):
     """Set the RepairAgent reference for the scheduler to use."""
     global _repair_agent_ref
@@ -6324,22 +6339,9 @@ JSON以外の文字は出力しないでください。"""}],
     @staticmethod
     def _classify_slack_command(text: str) -> str:
         """甲原のメッセージからコマンド種別を判定する。"""
-        stop_keywords = ["止まって", "ストップ", "止めて", "待って", "やめて"]
-        status_keywords = ["状況は", "どうなってる", "今何してる", "ステータス"]
-        resume_keywords = ["再開", "動いて", "始めて", "起きて"]
-        mode_keywords = ["レベルアップ", "レベル2", "レベル3", "lv.2", "lv.3", "lv2", "lv3",
-                         "mode report", "mode propose", "mode execute",
-                         "モード変更", "レベル変更"]
-
-        lower = text.lower()
-        if any(kw in lower for kw in stop_keywords):
-            return "stop"
-        if any(kw in lower for kw in status_keywords):
-            return "status"
-        if any(kw in lower for kw in resume_keywords):
-            return "resume"
-        if any(kw in lower for kw in mode_keywords):
-            return "mode_change"
+        for command, pattern in _SLACK_COMMAND_RES:
+            if pattern.search(text):
+                return command
         return "instruction"
 
     @staticmethod
@@ -0,0 +1,104 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+SYSTEM_DIR = Path(__file__).resolve().parent
+
+if str(SYSTEM_DIR) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_DIR))
+
+import kpi_processor as kp
+
+
+class FakeWorksheet:
+    id = 7
+    row_count = 1000
+
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]
+
+
+class FakeSpreadsheet:
+    """batch_update の行削除・挿入・値書き込みを FakeWorksheet に適用する"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.calls = []
+
+    def batch_update(self, body):
+        self.calls.append(body["requests"])
+        rows = self.ws.rows
+        for request in body["requests"]:
+            kind, spec = next(iter(request.items()))
+            if kind == "deleteDimension":
+                r = spec["range"]
+                del rows[r["startIndex"]:r["endIndex"]]
+            elif kind == "insertDimension":
+                r = spec["range"]
+                rows[r["startIndex"]:r["startIndex"]] = [[] for _ in range(r["endIndex"] - r["startIndex"])]
+            elif kind == "updateCells":
+                values = [
+                    [cell["userEnteredValue"]["stringValue"] for cell in row["values"]]
+                    for row in spec["rows"]
+                ]
+                if "range" in spec:
+                    rows[:] = values
+                else:
+                    start = spec["start"]["rowIndex"]
+                    for i, row in enumerate(values):
+                        while len(rows) <= start + i:
+                            rows.append([])
+                        rows[start + i][:len(row)] = row
+
+
+def _full_rewrite(requests):
+    return any("updateCells" in r and "range" in r["updateCells"] for r in requests)
+
+
+class ApplyDateRowsTest(unittest.TestCase):
+    HEADER = [["日付", "値"]]
+
+    def apply(self, body, blocks):
+        ws = FakeWorksheet(self.HEADER + body)
+        ss = FakeSpreadsheet(ws)
+        result = kp._apply_date_rows(ss, ws, self.HEADER + body, 0, blocks, 2)
+        self.assertEqual(len(ss.calls), 1)
+        self.assertEqual(ws.rows, result)
+        return result, ss.calls[0]
+
+    def test_sorted_sheet_inserts_rows_in_place(self):
+        body = [["2026-03-05", "a"], ["2026-03-03", "b"], ["2026-03-01", "c"]]
+        result, requests = self.apply(body, [("2026-03-04", [["2026-03-04", "new"]]),
+                                             ("2026-03-01", [["2026-03-01", "c2"]])])
+
+        self.assertFalse(_full_rewrite(requests))
+        self.assertEqual(
+            [row[0] for row in result[1:]],
+            ["2026-03-05", "2026-03-04", "2026-03-03", "2026-03-01"],
+        )
+        self.assertIn(["2026-03-01", "c2"], result)
+        self.assertNotIn(["2026-03-01", "c"], result)
+
+    def test_blank_rows_are_dropped_and_tab_rewritten(self):
+        body = [["2026-03-05", "a"], ["", ""], [], ["2026-03-01", "c"]]
+        result, requests = self.apply(body, [("2026-03-03", [["2026-03-03", "new"]])])
+
+        self.assertTrue(_full_rewrite(requests))
+        self.assertEqual(result, self.HEADER + [
+            ["2026-03-05", "a"], ["2026-03-03", "new"], ["2026-03-01", "c"],
+        ])
+
+    def test_unsorted_rows_are_resorted(self):
+        body = [["2026-03-01", "c"], ["2026-03-05", "a"], ["2026-03-03", "b"]]
+        result, requests = self.apply(body, [("2026-03-04", [["2026-03-04", "new"]])])
+
+        self.assertTrue(_full_rewrite(requests))
+        self.assertEqual(
+            [row[0] for row in result[1:]],
+            ["2026-03-05", "2026-03-04", "2026-03-03", "2026-03-01"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()